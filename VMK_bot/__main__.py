@@ -1,8 +1,9 @@
 """Main for module."""
 
+import os
 from . import server
 from . import extract_tables
 
 if __name__ == '__main__':
-    extract_tables.setup()
+    extract_tables.setup(jobs=os.cpu_count() or 1)
     server.run_server()
@@ -0,0 +1,106 @@
+"""Daily broadcast of tomorrow's schedule for Schedule Telegram bot."""
+
+import asyncio
+import logging
+from datetime import datetime, time, timedelta
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.messageUI import MessageToUser
+from VMK_bot.metrics import Metrics
+from VMK_bot.outbound import Outbox
+from VMK_bot.schedule import Schedule
+
+log = logging.getLogger(__name__)
+
+
+class Broadcaster:
+    """Sends tomorrow's schedule to subscribed users every day at the configured time.
+
+    Schedule is rendered once for every group and language and sent to all subscribers of the group
+    as bulk messages of Outbox, so replies go first and both share its rate limit.
+    Subscriptions of chats which blocked the bot are cancelled.
+
+    Args:
+        outbox (Outbox): outbox sending messages of the bot
+        adb (AsyncDatabase): database with students and schedule
+        at (str | None): time of broadcast as 'HH:MM', None disables broadcast
+    """
+
+    def __init__(self, outbox: Outbox, adb: AsyncDatabase, at: str | None = '20:00') -> None:
+        """Init method."""
+        self.outbox = outbox
+        self.adb = adb
+        self.at = time.fromisoformat(at) if at else None
+        self._task = None
+
+    @staticmethod
+    def seconds_until(at: time, now: datetime) -> float:
+        """Returns seconds until the next occurrence of time of day.
+
+        Args:
+            at (time): time of day
+            now (datetime): current time
+        Returns:
+            float
+        """
+        target = datetime.combine(now.date(), at)
+        if target <= now:
+            target += timedelta(days=1)
+        return (target - now).total_seconds()
+
+    async def broadcast(self, now: datetime | None = None) -> int:
+        """Sends tomorrow's schedule to all subscribers.
+
+        Args:
+            now (datetime | None): current time
+        Returns:
+            int: number of messages sent
+        """
+        now = now or datetime.now()
+        tomorrow = now + timedelta(days=1)
+        weekday = Schedule.number_to_weekday(tomorrow.weekday())
+        if weekday == 'Воскресенье':
+            return 0
+
+        parity = tomorrow.isocalendar()[1] % 2
+        texts = {}
+        sending = {}
+        for group_number, language, chat_id in await self.adb.read(Database().get_subscribers):
+            text = texts.get((group_number, language))
+            if text is None:
+                schedule = await self.adb.read(Schedule.get_today_schedule, group_number, parity, weekday, language, now)
+                text = texts[group_number, language] = MessageToUser.translate('Держите ваше расписание на завтра\n', language) + schedule
+            sending[chat_id] = self.outbox.send_bulk(chat_id, text, parse_mode='HTML')
+
+        results = dict(zip(sending, await asyncio.gather(*sending.values())))
+        metrics = Metrics()
+        for result in results.values():
+            metrics.broadcast.inc('sent' if result == 'sent' else 'failed')
+
+        blocked = [chat_id for chat_id, result in results.items() if result == 'blocked']
+        if blocked:
+            await self.adb.write(Database().unsubscribe_chats, blocked)
+        return sum(result == 'sent' for result in results.values())
+
+    async def _run(self) -> None:
+        """Broadcasts schedule every day."""
+        while True:
+            await asyncio.sleep(Broadcaster.seconds_until(self.at, datetime.now()))
+            try:
+                print(f"Tomorrow's schedule is sent to {await self.broadcast()} chats")
+            except Exception:
+                log.exception("Failed to broadcast tomorrow's schedule")
+
+    def start(self) -> None:
+        """Starts daily broadcast if its time is configured."""
+        if self._task is None and self.at is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops daily broadcast."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,77 @@
+"""In-process caches for Schedule Telegram bot."""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """Bounded mapping with least-recently-used eviction.
+
+    Args:
+        maxsize (int): maximum number of stored entries
+        hits (int): number of successful lookups
+        misses (int): number of lookups of missing keys
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Init method."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns cached value and marks it as recently used.
+
+        Args:
+            key (Hashable): cache key
+            default (Any): value returned if key is not cached
+        Returns:
+            Any
+        """
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Returns cached value without marking it as used and counting the lookup.
+
+        Args:
+            key (Hashable): cache key
+            default (Any): value returned if key is not cached
+        Returns:
+            Any
+        """
+        return self._data.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores value, evicting the least recently used entry if cache is full.
+
+        Args:
+            key (Hashable): cache key
+            value (Any): value to store
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops all cached entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Len method."""
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Contains method."""
+        return key in self._data
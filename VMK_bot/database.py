@@ -1,45 +1,228 @@
 """Database module for Schedule Telegram bot."""
 
+import asyncio
+import functools
+import json
+import pathlib
+import shlex
 import sqlite3 as sq
-from aiogram.dispatcher import FSMContext
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from VMK_bot.lessons import NormalLesson, Lesson, WEEKDAYS
+from VMK_bot.metrics import Metrics
 
 
 class Database:
-    """Singleton database class."""
+    """Singleton database class.
+
+    Every thread works with its own connection, so methods can be called from worker threads.
+
+    Args:
+        PATH (str): path to database file
+    """
+
+    PATH = 'users.db'
 
     def __new__(cls):
         """Method new."""
         if not hasattr(cls, 'instance'):
             cls.instance = super().__new__(cls)
+            cls.instance._local = threading.local()
         return cls.instance
 
-    def connect(self) -> None:
-        """Method to connect to database."""
-        if not hasattr(self, 'db'):
-            self.db = sq.connect('users.db')
-            self.cur = self.db.cursor()
+    @property
+    def db(self) -> sq.Connection:
+        """Connection of the current thread."""
+        return self._local.db
+
+    @property
+    def cur(self) -> sq.Cursor:
+        """Cursor of the current thread."""
+        return self._local.cur
+
+    def connect(self, readonly: bool = False) -> None:
+        """Method to connect to database.
+
+        Args:
+            readonly (bool): open read-only connection, database is supposed to be already created
+        """
+        if hasattr(self._local, 'db'):
+            return
+
+        if readonly:
+            self._local.db = sq.connect(pathlib.Path(Database.PATH).absolute().as_uri() + '?mode=ro', uri=True)
+            self._local.cur = self._local.db.cursor()
+            return
 
+        self._local.db = sq.connect(Database.PATH)
+        self._local.cur = self._local.db.cursor()
         self.cur.execute(
-            'CREATE TABLE IF NOT EXISTS students(username TEXT PRIMARY KEY, group_number TEXT, state TEXT)')
+            'CREATE TABLE IF NOT EXISTS students(username TEXT PRIMARY KEY, group_number TEXT, state TEXT, chat_id INTEGER,'
+            'language TEXT, subscribed BOOL NOT NULL DEFAULT 0)')
         self.db.commit()
         self.cur.execute(
-            'CREATE TABLE IF NOT EXISTS schedule(group_number TEXT, parity BOOL, Понедельник TEXT, Вторник TEXT,'
-            'Среда TEXT, Четверг TEXT, Пятница TEXT, Суббота TEXT)')
+            'CREATE TABLE IF NOT EXISTS schedule_versions(version INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT,'
+            'imported_at TEXT, active BOOL)')
+        self.cur.execute(
+            'CREATE TABLE IF NOT EXISTS lessons(group_number TEXT, parity BOOL, weekday INTEGER, slot INTEGER,'
+            'start INTEGER, end INTEGER, description TEXT, version INTEGER)')
+        self.cur.execute('CREATE TABLE IF NOT EXISTS active_groups(group_number TEXT PRIMARY KEY, version INTEGER)')
         self.db.commit()
         self.cur.execute('CREATE TABLE IF NOT EXISTS hashes(hash TEXT)')
+        self.cur.execute(
+            'CREATE TABLE IF NOT EXISTS pdf_manifest(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT,'
+            'version INTEGER)')
+        self.cur.execute(
+            "CREATE TABLE IF NOT EXISTS fsm(chat TEXT, user TEXT, state TEXT, data TEXT NOT NULL DEFAULT '{}',"
+            'PRIMARY KEY (chat, user))')
+        self.cur.execute(
+            'CREATE TABLE IF NOT EXISTS rendered(group_number TEXT, parity BOOL, weekday TEXT, language TEXT, version INTEGER,'
+            'text TEXT, times TEXT, PRIMARY KEY (group_number, parity, weekday, language)) WITHOUT ROWID')
         self.db.commit()
+        self._migrate_students()
+        self._migrate_lessons()
+        self._migrate_schedule()
+
+    def close(self) -> None:
+        """Method to close connection of the current thread."""
+        if hasattr(self._local, 'db'):
+            self.db.close()
+            del self._local.db, self._local.cur
 
-    def update_schedule(self, group_number: str, parity: bool, table_entry: list[str]) -> None:
-        """Method to update table schedule with new entry.
+    def _add_legacy_version(self) -> int:
+        """Adds active schedule version for lessons imported before versioning, source of such version is unknown.
+
+        Returns:
+            int: number of version
+        """
+        self.cur.execute("INSERT INTO schedule_versions(source, imported_at, active) VALUES(NULL, datetime('now'), 1)")
+        return self.cur.lastrowid
+
+    def _migrate_students(self) -> None:
+        """Adds columns of broadcast subscription to students table created before subscriptions."""
+        columns = [column[1] for column in self.cur.execute('PRAGMA table_info(students)').fetchall()]
+        with self.db:
+            if 'chat_id' not in columns:
+                self.cur.execute('ALTER TABLE students ADD COLUMN chat_id INTEGER')
+                self.cur.execute('ALTER TABLE students ADD COLUMN language TEXT')
+                self.cur.execute('ALTER TABLE students ADD COLUMN subscribed BOOL NOT NULL DEFAULT 0')
+
+    def _migrate_lessons(self) -> None:
+        """Moves lessons imported before versioning into a legacy version."""
+        columns = [column[1] for column in self.cur.execute('PRAGMA table_info(lessons)').fetchall()]
+        with self.db:
+            if 'version' not in columns:
+                self.cur.execute('ALTER TABLE lessons ADD COLUMN version INTEGER')
+            self.cur.execute('DROP INDEX IF EXISTS lessons_day')
+            self.cur.execute('CREATE INDEX IF NOT EXISTS lessons_version ON lessons(version, group_number, parity, weekday, slot)')
+            if self.cur.execute('SELECT 1 FROM lessons WHERE version IS NULL LIMIT 1').fetchone():
+                version = self._add_legacy_version()
+                self.cur.execute('UPDATE lessons SET version=? WHERE version IS NULL', (version,))
+                self._activate_groups(version)
+
+    def _migrate_schedule(self) -> None:
+        """Moves lessons from legacy schedule table (JSON arrays of shlex-encoded strings) into lessons table."""
+        legacy = self.cur.execute("SELECT name FROM sqlite_master WHERE type=='table' AND name=='schedule'").fetchone()
+        if not legacy:
+            return
+
+        rows = list()
+        for group_number, parity, *days in self.cur.execute('SELECT * FROM schedule').fetchall():
+            for weekday, day in enumerate(days):
+                for slot, lesson in enumerate(json.loads(day), 1):
+                    _, start_time, end_time, description = shlex.split(lesson)
+                    start, end = Lesson.to_minutes(start_time), Lesson.to_minutes(end_time)
+                    if description and start is not None and end is not None:
+                        rows.append((group_number, parity, weekday, slot, start, end, description))
+
+        with self.db:
+            version = self._add_legacy_version()
+            self.cur.executemany('INSERT INTO lessons VALUES(?, ?, ?, ?, ?, ?, ?, ?)', [row + (version,) for row in rows])
+            self._activate_groups(version)
+            self.cur.execute('DROP TABLE schedule')
+
+    def _activate_groups(self, version: int, replace: bool = True) -> None:
+        """Makes groups of the version served from it.
 
         Args:
-            group_number (str): user's group
-            parity (bool): parity of the week
-            table_entry (list[str]): list of schedules for each day in a week
+            version (int): number of version
+            replace (bool): replace groups served from other versions
         """
-        self.cur.execute('INSERT INTO schedule VALUES(?, ?, ?, ?, ?, ?, ?, ?)',
-                         (group_number, parity, *table_entry))
-        self.db.commit()
+        self.cur.execute(f'INSERT OR {"REPLACE" if replace else "IGNORE"} INTO active_groups '
+                         'SELECT DISTINCT group_number, version FROM lessons WHERE version==?', (version,))
+
+    def _delete_versions(self, versions: str, parameters: tuple) -> None:
+        """Deletes schedule versions with their lessons.
+
+        Args:
+            versions (str): query selecting numbers of versions
+            parameters (tuple): parameters of the query
+        """
+        self.cur.execute(f'DELETE FROM lessons WHERE version IN ({versions})', parameters)
+        self.cur.execute(f'DELETE FROM rendered WHERE version IN ({versions})', parameters)
+        self.cur.execute(f'DELETE FROM schedule_versions WHERE version IN ({versions})', parameters)
+
+    def import_schedule(self, source: str, lessons: list[tuple[str, bool, int, NormalLesson]]) -> int:
+        """Method to import schedule from one pdf table as a new version.
+
+        Lessons are loaded and the new version is activated in one transaction, so readers see either
+        the previous or the new schedule. Groups of the new version are served from it, the previous version
+        of the same source is kept for rollback and older ones are deleted.
+
+        Args:
+            source (str): pdf table the schedule is imported from
+            lessons (list[tuple[str, bool, int, NormalLesson]]): group, parity, number of weekday and lesson
+        Returns:
+            int: number of the new version
+        """
+        with self.db:
+            self.cur.execute("INSERT INTO schedule_versions(source, imported_at, active) VALUES(?, datetime('now'), 1)",
+                             (source,))
+            version = self.cur.lastrowid
+            self.cur.executemany('INSERT INTO lessons VALUES(?, ?, ?, ?, ?, ?, ?, ?)',
+                                 [(group_number, parity, weekday, lesson.slot, lesson.start, lesson.end, lesson.description,
+                                   version) for group_number, parity, weekday, lesson in lessons])
+
+            self._delete_versions('SELECT version FROM schedule_versions WHERE NOT active AND (source==? OR source IS NULL)',
+                                  (source,))
+            previous = 'SELECT version FROM schedule_versions WHERE active AND source==? AND version!=?'
+            self.cur.execute(f'DELETE FROM active_groups WHERE version IN ({previous})', (source, version))
+            self.cur.execute(f'UPDATE schedule_versions SET active=0 WHERE version IN ({previous})', (source, version))
+            self._activate_groups(version)
+            self.cur.execute('UPDATE schedule_versions SET active=0 WHERE active AND version NOT IN (SELECT version FROM active_groups)')
+        return version
+
+    def rollback_schedule(self, version: int) -> None:
+        """Method to delete imported version and activate the previous version of the same source.
+
+        Manifest entries of the deleted version point to the restored version, so unchanged pdf table is not imported again.
+
+        Args:
+            version (int): number of active version to roll back
+        """
+        row = self.cur.execute('SELECT source FROM schedule_versions WHERE version==? AND active', (version,)).fetchone()
+        if not row:
+            raise ValueError(f'Schedule version {version} is not active')
+
+        with self.db:
+            previous = self.cur.execute('SELECT MAX(version) FROM schedule_versions WHERE source==? AND NOT active AND version<?',
+                                        (row[0], version)).fetchone()[0]
+            self.cur.execute('DELETE FROM active_groups WHERE version==?', (version,))
+            self._delete_versions('SELECT ?', (version,))
+            if previous is not None:
+                self.cur.execute('UPDATE schedule_versions SET active=1 WHERE version==?', (previous,))
+                self._activate_groups(previous, replace=False)
+            self.cur.execute('UPDATE pdf_manifest SET version=? WHERE version==?', (previous, version))
+
+    def get_schedule_versions(self) -> list[tuple[int, str, str, bool]]:
+        """Method to get all stored schedule versions.
+
+        Returns:
+            list[tuple[int, str, str, bool]]: version, source, import time and is version active
+        """
+        return self.cur.execute('SELECT version, source, imported_at, active FROM schedule_versions').fetchall()
 
     def get_valid_groups(self) -> list[str]:
         """Method to get valid groups.
@@ -47,22 +230,61 @@ class Database:
         Returns:
             list[str]
         """
-        groups = self.cur.execute('SELECT DISTINCT group_number FROM schedule').fetchall()
+        groups = self.cur.execute('SELECT group_number FROM active_groups').fetchall()
         return [group[0] for group in groups]
 
-    def get_schedule(self, group_number: str, parity: bool, weekday: str) -> str:
-        """Method to get schedule by group_number, parity of week and weekday.
+    def get_active_versions(self, groups: list[str] | None = None) -> dict[str, int]:
+        """Method to get schedule versions groups are served from.
+
+        Args:
+            groups (list[str] | None): groups, all groups if None
+        Returns:
+            dict[str, int]
+        """
+        versions = dict(self.cur.execute('SELECT group_number, version FROM active_groups').fetchall())
+        if groups is None:
+            return versions
+        return {group_number: versions[group_number] for group_number in groups if group_number in versions}
+
+    def get_lessons(self, group_number: str, parity: bool, weekday: str) -> list[NormalLesson]:
+        """Method to get lessons by group_number, parity of week and weekday.
 
         Args:
             group_number (str): user's group
             parity (bool): parity of the week
             weekday (str): day of the week
         Returns:
-            str
+            list[NormalLesson]
+        """
+        lessons = self.cur.execute('SELECT slot, start, end, description FROM active_groups JOIN lessons USING(group_number, version) '
+                                   'WHERE group_number==? AND parity==? AND weekday==? ORDER BY slot',
+                                   (group_number, parity, WEEKDAYS.index(weekday))).fetchall()
+        return [NormalLesson(*lesson) for lesson in lessons]
+
+    def store_rendered(self, rows: list[tuple[str, bool, str, str, int, str, str]]) -> None:
+        """Method to store rendered schedules in one transaction, replacing previous ones.
+
+        Args:
+            rows (list[tuple[str, bool, str, str, int, str, str]]): group, parity, weekday or 'week', language,
+                                                                  version the schedule is rendered from, text and times in JSON
+        """
+        with self.db:
+            self.cur.executemany('INSERT OR REPLACE INTO rendered VALUES(?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def get_rendered(self, group_number: str, parity: bool, weekday: str, language: str) -> tuple[str, str] | None:
+        """Method to get rendered schedule if it is rendered from the version the group is served from.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            weekday (str): day of the week or 'week'
+            language (str): loaded language
+        Returns:
+            tuple[str, str] | None: text and start and end minutes of lessons in JSON
         """
-        schedule = self.cur.execute('SELECT {} FROM schedule WHERE group_number=="{}" AND parity=={}'
-                                    .format(weekday, group_number, parity)).fetchone()
-        return schedule[0]
+        return self.cur.execute('SELECT text, times FROM rendered JOIN active_groups USING(group_number, version) '
+                                'WHERE group_number==? AND parity==? AND weekday==? AND language==?',
+                                (group_number, parity, weekday, language)).fetchone()
 
     def add_user(self, username: str) -> None:
         """Method to add a new user.
@@ -70,73 +292,193 @@ class Database:
         Args:
             username (str): username
         """
-        user = self.cur.execute('SELECT username FROM students WHERE username=="{}"'.format(username)).fetchone()
+        user = self.cur.execute('SELECT username FROM students WHERE username==?', (username,)).fetchone()
         if not user:
-            self.cur.execute('INSERT INTO students VALUES(?, ?, ?)', (username, '', 'processing'))
+            self.cur.execute('INSERT INTO students(username, group_number, state) VALUES(?, ?, ?)', (username, '', 'processing'))
             self.db.commit()
 
-    async def edit_user_group(self, state: FSMContext, username: str) -> None:
-        """Method to edit user's group.
+    def update_users(self, users: dict[str, dict[str, str]]) -> None:
+        """Method to apply updates of many users in one transaction.
+
+        Unknown users are added first, as add_user does.
 
         Args:
-            state (FSMContext): user's state
-            username (str): username
+            users (dict[str, dict[str, str]]): new 'group_number', 'state', 'chat_id', 'language' and/or 'subscribed' by username
         """
-        async with state.proxy() as data:
-            self.cur.execute(
-                'UPDATE students SET group_number="{}" WHERE username=="{}"'.format(data['group'], username))
-            self.db.commit()
+        with self.db:
+            self.cur.executemany('INSERT OR IGNORE INTO students(username, group_number, state) VALUES(?, ?, ?)',
+                                 [(username, '', 'processing') for username in users])
+            self.cur.executemany('UPDATE students SET group_number=COALESCE(?, group_number), state=COALESCE(?, state), '
+                                 'chat_id=COALESCE(?, chat_id), language=COALESCE(?, language), subscribed=COALESCE(?, subscribed) '
+                                 'WHERE username==?',
+                                 [(user.get('group_number'), user.get('state'), user.get('chat_id'), user.get('language'),
+                                   user.get('subscribed'), username) for username, user in users.items()])
 
-    async def edit_user_state(self, state: FSMContext, username: str) -> None:
-        """Method to edit user's state.
+    def get_user(self, username: str) -> tuple[str, str] | None:
+        """Method to get user's state and group.
 
         Args:
-            state (FSMContext): user's state
             username (str): username
+        Returns:
+            tuple[str, str] | None: state and group, None if there is no such user
         """
-        async with state.proxy() as data:
-            self.cur.execute('UPDATE students SET state="{}" WHERE username=="{}"'.format(data['state'], username))
-            self.db.commit()
+        return self.cur.execute('SELECT state, group_number FROM students WHERE username==?', (username,)).fetchone()
+
+    def get_subscribers(self) -> list[tuple[str, str | None, int]]:
+        """Method to get chats subscribed to broadcast of tomorrow's schedule.
 
-    def get_user_state(self, username: str) -> str:
-        """Method to get user's state.
+        Returns:
+            list[tuple[str, str | None, int]]: group, language and chat id, ordered by group and language
+        """
+        return self.cur.execute('SELECT group_number, language, chat_id FROM students JOIN active_groups USING(group_number) '
+                                'WHERE subscribed AND chat_id IS NOT NULL ORDER BY group_number, language').fetchall()
+
+    def unsubscribe_chats(self, chat_ids: list[int]) -> None:
+        """Method to cancel subscriptions of chats, e.g. which blocked the bot.
 
         Args:
-            username (str): username
+            chat_ids (list[int]): chat ids
+        """
+        with self.db:
+            self.cur.executemany('UPDATE students SET subscribed=0 WHERE chat_id==?', [(chat_id,) for chat_id in chat_ids])
+
+    def get_fsm(self, chat: str, user: str) -> tuple[str | None, str] | None:
+        """Method to get FSM state and data of user in chat.
+
+        Args:
+            chat (str): chat id
+            user (str): user id
         Returns:
-            str
+            tuple[str | None, str] | None: state and data in JSON, None if nothing is stored
         """
-        state = self.cur.execute('SELECT state FROM students WHERE username=="{}"'.format(username)).fetchone()
-        if not state:
-            return 'processing'
-        return state[0]
+        return self.cur.execute('SELECT state, data FROM fsm WHERE chat==? AND user==?', (chat, user)).fetchone()
+
+    def update_fsm(self, records: dict[tuple[str, str], dict[str, str | None]]) -> None:
+        """Method to apply updates of FSM of many users in one transaction.
 
-    def get_user_group(self, username: str) -> str:
-        """Method to get user's group.
+        Records with no state and empty data are deleted.
 
         Args:
-            username (str): username
+            records (dict[tuple[str, str], dict[str, str | None]]): new 'state' and/or 'data' in JSON by (chat, user)
+        """
+        with self.db:
+            self.cur.executemany('INSERT OR IGNORE INTO fsm(chat, user) VALUES(?, ?)', list(records))
+            self.cur.executemany('UPDATE fsm SET state=? WHERE chat==? AND user==?',
+                                 [(fields['state'], *key) for key, fields in records.items() if 'state' in fields])
+            self.cur.executemany('UPDATE fsm SET data=? WHERE chat==? AND user==?',
+                                 [(fields['data'], *key) for key, fields in records.items() if 'data' in fields])
+            self.cur.executemany("DELETE FROM fsm WHERE chat==? AND user==? AND state IS NULL AND data=='{}'", list(records))
+
+    def get_manifest_entry(self, path: str) -> tuple[int, int, str, int | None] | None:
+        """Method to get what is known about imported pdf table.
+
+        Args:
+            path (str): path to pdf table
         Returns:
-            str
+            tuple[int, int, str, int | None] | None: size, modification time in ns, md5 hash and imported version
         """
-        state = self.cur.execute('SELECT group_number FROM students WHERE username=="{}"'.format(username)).fetchone()
-        if not state:
-            return 'none'
-        return state[0]
+        return self.cur.execute('SELECT size, mtime_ns, hash, version FROM pdf_manifest WHERE path==?', (path,)).fetchone()
 
-    def add_hash(self, my_hash: str) -> bool:
-        """Method to add a new hash.
+    def update_manifest(self, path: str, size: int, mtime_ns: int, my_hash: str, version: int | None) -> None:
+        """Method to store what is known about imported pdf table.
 
         Args:
-            my_hash (str): hash to store in database
+            path (str): path to pdf table
+            size (int): size of file in bytes
+            mtime_ns (int): modification time of file in ns
+            my_hash (str): md5 hash of file
+            version (int | None): schedule version imported from file, None if it was imported before versioning
+        """
+        self.cur.execute('INSERT OR REPLACE INTO pdf_manifest VALUES(?, ?, ?, ?, ?)', (path, size, mtime_ns, my_hash, version))
+        self.db.commit()
+
+    def has_legacy_hash(self, my_hash: str) -> bool:
+        """Method to check if pdf table was imported before the manifest was introduced.
+
+        Args:
+            my_hash (str): md5 hash of file
 
         Returns:
             bool: True if my_hash is in database. Otherwise False
+        """
+        return self.cur.execute('SELECT hash FROM hashes WHERE hash==?', (my_hash,)).fetchone() is not None
+
+
+class AsyncDatabase:
+    """Runs Database methods on worker threads, so the event loop never blocks on disk I/O.
+
+    Reads are executed on a pool of threads with read-only connections and writes on a single
+    writer thread. The writer switches database into WAL mode, so reads never wait on writes.
+
+    Args:
+        readers (int): number of reader threads
+    """
+
+    def __init__(self, readers: int = 4) -> None:
+        """Init method."""
+        self.readers = readers
+        self._read_pool = None
+        self._write_pool = None
+
+    @staticmethod
+    def _connect_writer() -> None:
+        """Opens writer connection of the current thread."""
+        db = Database()
+        db.connect()
+        db.cur.execute('PRAGMA journal_mode=WAL')
+        db.cur.execute('PRAGMA synchronous=NORMAL')
+
+    @staticmethod
+    def _connect_reader() -> None:
+        """Opens read-only connection of the current thread."""
+        Database().connect(readonly=True)
+
+    async def start(self) -> None:
+        """Starts worker threads, database is created by writer before any read."""
+        self._write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-writer',
+                                              initializer=AsyncDatabase._connect_writer)
+        await self.write(lambda: None)
+        self._read_pool = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix='db-reader',
+                                             initializer=AsyncDatabase._connect_reader)
 
+    async def close(self) -> None:
+        """Waits for pending queries and stops worker threads, queries after that raise RuntimeError."""
+        for pool in (self._read_pool, self._write_pool):
+            if pool is not None:
+                await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+        self._read_pool = self._write_pool = None
+
+    @staticmethod
+    async def _run(kind: str, pool: ThreadPoolExecutor | None, func: Callable[..., Any], args: tuple) -> Any:
+        """Runs function on pool and records its latency."""
+        if pool is None:  # threads of default executor have no connection
+            raise RuntimeError(f'Database is not started or already closed, {kind} of {getattr(func, "__name__", func)} is rejected')
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, functools.partial(func, *args))
+        finally:
+            Metrics().db_seconds.observe(time.perf_counter() - start, kind, getattr(func, '__name__', type(func).__name__))
+
+    async def read(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs function that only reads from database on a reader thread.
+
+        Args:
+            func (Callable[..., Any]): function to run, usually method of Database
+            args (Any): arguments of function
+        Returns:
+            Any: result of function
         """
-        user = self.cur.execute('SELECT hash FROM hashes WHERE hash=="{}"'.format(my_hash)).fetchone()
-        if not user:
-            self.cur.execute('INSERT INTO hashes VALUES(?)', (my_hash,))
-            self.db.commit()
-            return False
-        return True
+        return await self._run('read', self._read_pool, func, args)
+
+    async def write(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs function that writes into database on the writer thread.
+
+        Writes are executed one by one in order they were requested.
+
+        Args:
+            func (Callable[..., Any]): function to run, usually method of Database
+            args (Any): arguments of function
+        Returns:
+            Any: result of function
+        """
+        return await self._run('write', self._write_pool, func, args)
@@ -1,24 +1,171 @@
 """Script to extract tables from pdf to json."""
 
-from .pdf_parser import Parser
+import argparse
 import glob
 from .database import Database
+from .groups import GroupRegistry
+from .schedule import Schedule
 import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 
-def setup():
-    """Extracts data from the pdf tables."""
+def parse_pdf(pdf_table: str, page_jobs: int = 1) -> tuple[str, dict, float]:
+    """Parses pdf table, is executed in worker process.
+
+    Args:
+        pdf_table (str): path to pdf table
+        page_jobs (int): number of processes parsing pages of the table
+    Returns:
+        tuple[str, dict, float]: path, parsed schedule and time of parsing in seconds
+    """
+    from .pdf_parser import Parser  # camelot takes long to import, so it is imported only if there are tables to parse
+
+    start = time.perf_counter()
+    data = Parser.parse_schedule(pdf_table, jobs=page_jobs)
+    return pdf_table, data, time.perf_counter() - start
+
+
+def setup(jobs: int = 1, page_jobs: int = 1, directory: str = 'schedule_tables'):
+    """Extracts data from the pdf tables.
+
+    Tables are parsed in jobs worker processes, parsed data is written into database by this process.
+
+    Args:
+        jobs (int): number of pdf tables parsed simultaneously
+        page_jobs (int): number of processes parsing pages of every table
+        directory (str): directory with pdf tables
+    """
+    import_tables(jobs, page_jobs, directory)
+    GroupRegistry().refresh()
+
+
+def import_tables(jobs: int = 1, page_jobs: int = 1, directory: str = 'schedule_tables') -> list[str]:
+    """Imports changed pdf tables from directory.
+
+    Args:
+        jobs (int): number of pdf tables parsed simultaneously
+        page_jobs (int): number of processes parsing pages of every table
+        directory (str): directory with pdf tables
+    Returns:
+        list[str]: imported pdf tables
+    """
     db = Database()
     db.connect()
 
-    for pdf_table in glob.glob("schedule_tables/*.pdf"):
+    changed = find_changed_tables(glob.glob(os.path.join(directory, "*.pdf")))
+    if jobs > 1 and len(changed) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(changed))) as pool:
+            for pdf_table, data, parse_time in pool.map(parse_pdf, changed, [page_jobs] * len(changed)):
+                _save(pdf_table, changed[pdf_table], data, parse_time)
+    else:
+        for pdf_table, stamp in changed.items():
+            _save(pdf_table, stamp, *parse_pdf(pdf_table, page_jobs)[1:])
+    return list(changed)
+
+
+def reload_tables(directory: str, database: str) -> list[str]:
+    """Imports changed pdf tables, is executed in worker process of running bot.
+
+    Args:
+        directory (str): directory with pdf tables
+        database (str): path to database of the bot
+    Returns:
+        list[str]: imported pdf tables
+    """
+    Database.PATH = database
+    try:
+        return import_tables(directory=directory)
+    finally:
+        Database().close()
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Returns md5 hash of file, reading it in chunks.
+
+    Args:
+        path (str): path to file
+        chunk_size (int): size of chunk in bytes
+    Returns:
+        str
+    """
+    my_hash = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            my_hash.update(chunk)
+    return my_hash.hexdigest()
+
+
+def find_changed_tables(pdf_tables: list[str]) -> dict[str, tuple[int, int, str]]:
+    """Returns pdf tables which have to be imported.
+
+    Files with the same size and modification time as in the manifest are skipped without reading,
+    other files are hashed and compared with the hash of their last import.
+
+    Args:
+        pdf_tables (list[str]): paths to pdf tables
+    Returns:
+        dict[str, tuple[int, int, str]]: size, modification time in ns and md5 hash of changed tables
+    """
+    db = Database()
+    db.connect()
+
+    changed = dict()
+    for pdf_table in sorted(pdf_tables):
+        stat = os.stat(pdf_table)
+        entry = db.get_manifest_entry(pdf_table)
+        if entry and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            continue
+
         print(f"Getting data from {pdf_table}")
-        with open(pdf_table, "rb") as f:
-            my_hash = hashlib.md5(f.read()).hexdigest()
-        if not db.add_hash(my_hash):
+        my_hash = file_hash(pdf_table)
+        if entry and entry[2] == my_hash:
+            db.update_manifest(pdf_table, stat.st_size, stat.st_mtime_ns, my_hash, entry[3])
+        elif not entry and db.has_legacy_hash(my_hash):
+            db.update_manifest(pdf_table, stat.st_size, stat.st_mtime_ns, my_hash, None)
+        else:
             print(f"no {my_hash} in db")
-            Parser.import_schedule_to_database(pdf_table)
+            changed[pdf_table] = (stat.st_size, stat.st_mtime_ns, my_hash)
+    return changed
+
+
+def _save(pdf_table: str, stamp: tuple[int, int, str], data: dict, parse_time: float) -> None:
+    """Writes parsed pdf table into database, records it in the manifest and reports timing."""
+    from .pdf_parser import Parser
+
+    start = time.perf_counter()
+    version = Parser.save_schedule_to_database(data, pdf_table)
+    Database().update_manifest(pdf_table, *stamp, version)
+    print(f"Imported {pdf_table} as version {version}: parsed in {parse_time:.2f}s, saved in {time.perf_counter() - start:.2f}s")
+
+
+def main() -> None:
+    """Command line interface of import."""
+    parser = argparse.ArgumentParser(description='Import schedule from schedule_tables/*.pdf into database.')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of pdf tables parsed simultaneously')
+    parser.add_argument('-p', '--page-jobs', type=int, default=1, help='number of processes parsing pages of every table')
+    parser.add_argument('--rollback', type=int, metavar='VERSION',
+                        help='delete imported schedule version and return to the previous version of the same table')
+    parser.add_argument('--render', action='store_true', help='render replies of all groups again, e.g. after translations changed')
+    args = parser.parse_args()
+
+    if args.render:
+        print(f"Rendered {Schedule.prerender()} schedules")
+        return
+
+    if args.rollback is not None:
+        db = Database()
+        db.connect()
+        db.rollback_schedule(args.rollback)
+        Schedule.prerender()
+        print(f"Rolled back version {args.rollback}")
+        return
+
+    start = time.perf_counter()
+    setup(jobs=args.jobs, page_jobs=args.page_jobs)
+    print(f"Done in {time.perf_counter() - start:.2f}s")
 
 
 if __name__ == '__main__':
-    setup()
+    main()
@@ -0,0 +1,171 @@
+"""Persistent FSM storage for Schedule Telegram bot."""
+
+import copy
+import json
+from aiogram.dispatcher.storage import BaseStorage
+from VMK_bot.cache import LRUCache
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.write_behind import WriteBehindBuffer
+
+
+class FSMRecord:
+    """FSM state and data of user in chat.
+
+    Args:
+        state (str | None): state of user
+        data (dict): data of user
+    """
+
+    __slots__ = ('state', 'data')
+
+    def __init__(self, state: str | None, data: dict) -> None:
+        """Init method."""
+        self.state = state
+        self.data = data
+
+
+class SQLiteStorage(BaseStorage):
+    """FSM storage in the bot's database.
+
+    Records of recently active users are cached in memory and changes are written
+    in batches by write-behind buffer, so states survive restarts while memory stays bounded.
+
+    Args:
+        adb (AsyncDatabase): database with fsm table
+        maxsize (int): maximum number of cached records
+        cache (LRUCache): cached records by (chat, user)
+        buffer (WriteBehindBuffer): changes which are not written into database yet
+    """
+
+    def __init__(self, adb: AsyncDatabase, maxsize: int = 100000) -> None:
+        """Init method."""
+        self.adb = adb
+        self.cache = LRUCache(maxsize=maxsize)
+        self.buffer = WriteBehindBuffer(adb, writer=Database().update_fsm)
+
+    def _key(self, chat: str | int | None, user: str | int | None) -> tuple[str, str]:
+        """Returns key of record."""
+        return tuple(map(str, self.check_address(chat=chat, user=user)))
+
+    async def _get_record(self, key: tuple[str, str]) -> FSMRecord:
+        """Returns record, loading it from database if it isn't cached.
+
+        Args:
+            key (tuple[str, str]): chat and user
+        Returns:
+            FSMRecord
+        """
+        record = self.cache.get(key)
+        if record is not None:
+            return record
+
+        before = self.buffer.pending(key)
+        row = await self.adb.read(Database().get_fsm, *key)
+        after = self.buffer.pending(key)
+
+        record = self.cache.peek(key)  # could be loaded by another request meanwhile
+        if record is not None:
+            return record
+
+        state, data = (row[0], json.loads(row[1])) if row else (None, {})
+        fields = (before or {}) | (after or {})  # changes made before or during the read
+        record = FSMRecord(fields.get('state', state), json.loads(fields['data']) if 'data' in fields else data)
+        self.cache.put(key, record)
+        return record
+
+    def _write(self, key: tuple[str, str], **fields: str | None) -> None:
+        """Stores change of record, cached record is supposed to be already updated."""
+        self.buffer.update(key, **fields)
+
+    async def get_state(self, *, chat: str | int | None = None, user: str | int | None = None,
+                        default: str | None = None) -> str | None:
+        """Returns state of user in chat.
+
+        Args:
+            chat (str | int | None): chat id
+            user (str | int | None): user id
+            default (str | None): state returned if nothing is stored
+        Returns:
+            str | None
+        """
+        record = await self._get_record(self._key(chat, user))
+        return record.state if record.state is not None else self.resolve_state(default)
+
+    async def get_data(self, *, chat: str | int | None = None, user: str | int | None = None,
+                       default: dict | None = None) -> dict:
+        """Returns copy of data of user in chat.
+
+        Args:
+            chat (str | int | None): chat id
+            user (str | int | None): user id
+            default (dict | None): unused, empty data is returned if nothing is stored
+        Returns:
+            dict
+        """
+        return copy.deepcopy((await self._get_record(self._key(chat, user))).data)
+
+    async def set_state(self, *, chat: str | int | None = None, user: str | int | None = None, state=None) -> None:
+        """Sets state of user in chat.
+
+        Args:
+            chat (str | int | None): chat id
+            user (str | int | None): user id
+            state: new state, None to reset it
+        """
+        key, state = self._key(chat, user), self.resolve_state(state)
+        record = self.cache.peek(key)
+        if record is not None:
+            record.state = state
+        self._write(key, state=state)
+
+    async def set_data(self, *, chat: str | int | None = None, user: str | int | None = None, data: dict | None = None) -> None:
+        """Replaces data of user in chat.
+
+        Args:
+            chat (str | int | None): chat id
+            user (str | int | None): user id
+            data (dict | None): new data
+        """
+        key, data = self._key(chat, user), copy.deepcopy(data or {})
+        record = self.cache.peek(key)
+        if record is not None:
+            record.data = data
+        self._write(key, data=json.dumps(data))
+
+    async def update_data(self, *, chat: str | int | None = None, user: str | int | None = None, data: dict | None = None,
+                          **kwargs) -> None:
+        """Updates data of user in chat.
+
+        Args:
+            chat (str | int | None): chat id
+            user (str | int | None): user id
+            data (dict | None): new values
+            kwargs: new values
+        """
+        key = self._key(chat, user)
+        record = await self._get_record(key)
+        record.data.update(data or {}, **kwargs)
+        self._write(key, data=json.dumps(record.data))
+
+    async def reset_state(self, *, chat: str | int | None = None, user: str | int | None = None, with_data: bool = True) -> None:
+        """Resets state and data of user in chat.
+
+        Args:
+            chat (str | int | None): chat id
+            user (str | int | None): user id
+            with_data (bool): reset data too
+        """
+        await self.set_state(chat=chat, user=user, state=None)
+        if with_data:
+            await self.set_data(chat=chat, user=user, data={})
+
+    def start(self) -> None:
+        """Starts periodic writing of changes."""
+        self.buffer.start()
+
+    async def close(self) -> None:
+        """Stops periodic writing and writes the rest of changes."""
+        await self.buffer.stop()
+
+    async def wait_closed(self) -> None:
+        """Waits for storage to be closed, it is closed by close itself."""
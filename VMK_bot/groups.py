@@ -0,0 +1,85 @@
+"""Registry of valid group numbers for Schedule Telegram bot."""
+
+import re
+from VMK_bot.database import Database, AsyncDatabase
+
+
+class GroupRegistry:
+    """Singleton in-memory index of valid group numbers.
+
+    Args:
+        SEPARATORS (re.Pattern): separators users type between group and subgroup, e.g. '319 - 1'
+    """
+
+    SEPARATORS = re.compile(r'\s*[\s\-\\._/]\s*')
+
+    def __new__(cls):
+        """Method new."""
+        if not hasattr(cls, 'instance'):
+            cls.instance = super().__new__(cls)
+            cls.instance._index = None
+        return cls.instance
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Returns normalized form of group number, e.g. '319-1' -> '319/1'.
+
+        Args:
+            text (str): group number typed by user
+        Returns:
+            str
+        """
+        return GroupRegistry.SEPARATORS.sub('/', text.strip())
+
+    @staticmethod
+    def load_index() -> tuple[frozenset[str], dict[str, str]]:
+        """Loads valid groups from database and builds index of them.
+
+        Returns:
+            tuple[frozenset[str], dict[str, str]]: valid groups and group numbers by their forms typed by users
+        """
+        db = Database()
+        db.connect()
+
+        groups = frozenset(db.get_valid_groups())
+        aliases = {GroupRegistry.normalize(group): group for group in groups}
+        aliases.update({group: group for group in groups})
+        return groups, aliases
+
+    def refresh(self) -> None:
+        """Reloads valid groups from database and swaps the index at once."""
+        self._index = GroupRegistry.load_index()
+
+    async def refresh_async(self, adb: AsyncDatabase) -> None:
+        """Reloads valid groups on a reader thread, so the event loop only swaps the built index.
+
+        Args:
+            adb (AsyncDatabase): database with schedule
+        """
+        self._index = await adb.read(GroupRegistry.load_index)
+
+    @property
+    def groups(self) -> frozenset[str]:
+        """Valid group numbers."""
+        if self._index is None:
+            self.refresh()
+        return self._index[0]
+
+    def resolve(self, text: str | None) -> str | None:
+        """Returns valid group number matching user's text.
+
+        Args:
+            text (str | None): group number typed by user
+        Returns:
+            str | None: group number as stored in database or None if group is unknown
+        """
+        if not text:
+            return None
+        if self._index is None:
+            self.refresh()
+        aliases = self._index[1]
+        return aliases.get(text) or aliases.get(GroupRegistry.normalize(text))
+
+    def __contains__(self, text: str | None) -> bool:
+        """Contains method."""
+        return self.resolve(text) is not None
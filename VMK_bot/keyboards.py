@@ -1,15 +1,45 @@
 """Keyboards module for Schedule Telegram bot."""
 
+from typing import Callable
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.utils.payload import prepare_arg
 from VMK_bot.messageUI import MessageToUser
 
 
 class Keyboards:
-    """Class of keyboards for user."""
+    """Class of keyboards for user.
+
+    Keyboards depend only on the language, so every keyboard is built and serialized
+    to the JSON sent to Telegram once per language and rebuilt after translations are reloaded.
+    """
+
+    _cache = {}
+    _generation = None
 
     @staticmethod
-    def get_start_kb(language: str) -> ReplyKeyboardMarkup:
-        """Returns initial keyboard.
+    def _cached(name: str, language: str, build: Callable[[str], ReplyKeyboardMarkup]) -> str:
+        """Returns serialized keyboard from cache, building it on the first request.
+
+        Args:
+            name (str): name of keyboard
+            language (str): user's language
+            build (Callable[[str], ReplyKeyboardMarkup]): keyboard builder
+        Returns:
+            str: serialized ReplyKeyboardMarkup
+        """
+        if Keyboards._generation != MessageToUser.generation:
+            Keyboards._cache = {}
+            Keyboards._generation = MessageToUser.generation
+
+        kb = Keyboards._cache.get((name, language))
+        if kb is None:
+            kb = prepare_arg(build(MessageToUser.resolve_language(language)))
+            Keyboards._cache[(name, language)] = kb
+        return kb
+
+    @staticmethod
+    def build_start_kb(language: str) -> ReplyKeyboardMarkup:
+        """Builds initial keyboard.
 
         Args:
             language (str): user's language
@@ -22,8 +52,8 @@ class Keyboards:
         return kb
 
     @staticmethod
-    def get_cancel_kb(language: str) -> ReplyKeyboardMarkup:
-        """Returns keyboard for final state.
+    def build_cancel_kb(language: str) -> ReplyKeyboardMarkup:
+        """Builds keyboard for final state.
 
         Args:
             language (str): user's language
@@ -34,6 +64,29 @@ class Keyboards:
             [KeyboardButton(MessageToUser.translate('Расписание на сегодня  ▶️', language))],
             [KeyboardButton(MessageToUser.translate('Расписание на завтра  ⏩', language))],
             [KeyboardButton(MessageToUser.translate('Расписание на неделю  ⏭', language))],
+            [KeyboardButton(MessageToUser.translate('Следующая пара  ⏱', language))],
             [KeyboardButton(MessageToUser.translate('Вернуться назад  ↩️', language))]
         ], resize_keyboard=True)
         return kb
+
+    @staticmethod
+    def get_start_kb(language: str) -> str:
+        """Returns initial keyboard.
+
+        Args:
+            language (str): user's language
+        Returns:
+            str: serialized ReplyKeyboardMarkup
+        """
+        return Keyboards._cached('start', language, Keyboards.build_start_kb)
+
+    @staticmethod
+    def get_cancel_kb(language: str) -> str:
+        """Returns keyboard for final state.
+
+        Args:
+            language (str): user's language
+        Returns:
+            str: serialized ReplyKeyboardMarkup
+        """
+        return Keyboards._cached('cancel', language, Keyboards.build_cancel_kb)
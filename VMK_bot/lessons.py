@@ -0,0 +1,115 @@
+"""Lesson records for Schedule Telegram bot."""
+
+import re
+
+WEEKDAYS = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота")
+
+
+class Lesson:
+    """Lesson class to be inherited.
+
+    Args:
+        slot (int): number of the lesson in the day, starting from 1
+        start (int): Class start time in minutes from midnight
+        end (int): Class finish time in minutes from midnight
+    """
+
+    __slots__ = ('slot', 'start', 'end')
+
+    TIME = re.compile(r'^\s*(\d{1,2})\.(\d{2})\s*$')
+    TIME_RANGE = re.compile(r'^\s*(\d{1,2})\.(\d{2})\s*-\s*(\d{1,2})\.(\d{2})\s*$')
+
+    def __init__(self, slot: int, start: int, end: int) -> None:
+        """Init method."""
+        self.slot = slot
+        self.start = start
+        self.end = end
+
+    @staticmethod
+    def to_minutes(time: str) -> int | None:
+        """Converts time from table ('9.00') into minutes from midnight.
+
+        Args:
+            time (str): time in format H.MM
+        Returns:
+            int | None: None if time has wrong format
+        """
+        match = Lesson.TIME.match(time)
+        if match is None:
+            return None
+        return int(match[1]) * 60 + int(match[2])
+
+    @staticmethod
+    def to_time(minutes: int) -> str:
+        """Converts minutes from midnight into time as it is written in table ('9.00').
+
+        Args:
+            minutes (int): minutes from midnight
+        Returns:
+            str
+        """
+        return f'{minutes // 60}.{minutes % 60:02d}'
+
+    @property
+    def start_time(self) -> str:
+        """Class start time in format H.MM."""
+        return Lesson.to_time(self.start)
+
+    @property
+    def end_time(self) -> str:
+        """Class finish time in format H.MM."""
+        return Lesson.to_time(self.end)
+
+    def _fields(self) -> tuple:
+        """Returns values of all slots in order of constructor arguments."""
+        return tuple(getattr(self, attr) for cls in reversed(type(self).__mro__) for attr in getattr(cls, '__slots__', ()))
+
+    def __eq__(self, other: object) -> bool:
+        """Eq method."""
+        return type(self) is type(other) and self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        """Repr method."""
+        return f"{type(self).__name__}{self._fields()!r}"
+
+
+class NormalLesson(Lesson):
+    """Normal lesson.
+
+    Args:
+        description (str): text that describes normal lesson
+    """
+
+    __slots__ = ('description',)
+
+    def __init__(self, slot: int, start: int, end: int, description: str) -> None:
+        """Init method."""
+        super().__init__(slot, start, end)
+        self.description = description
+
+
+class DoubleLesson(Lesson):
+    """Odd/even week lesson.
+
+    Args:
+        description_up (str): description for a odd week lesson
+        description_down (str): description for a even week lesson
+    """
+
+    __slots__ = ('description_up', 'description_down')
+
+    def __init__(self, slot: int, start: int, end: int, description_up: str, description_down: str) -> None:
+        """Init method."""
+        super().__init__(slot, start, end)
+        self.description_up = description_up
+        self.description_down = description_down
+
+    def for_week(self, odd_week: bool) -> NormalLesson:
+        """Returns lesson for a week of given parity.
+
+        Args:
+            odd_week (bool): is week odd or even?
+        Returns:
+            NormalLesson
+        """
+        return NormalLesson(self.slot, self.start, self.end, self.description_down if odd_week else self.description_up)
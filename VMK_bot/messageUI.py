@@ -4,22 +4,38 @@ import os
 
 
 class MessageToUser:
-    """Performs translation of message into user's language - en/ru."""
+    """Performs translation of message into user's language - en/ru.
+
+    Args:
+        DEFAULT_LANGUAGE (str): language of messages in source code, used for unknown languages
+        catalogs (dict[str, dict[str, str]]): translated messages for every loaded language
+        generation (int): number of catalog loads, lets dependent caches detect reloads
+    """
+
+    TRANSLATION_PATH = os.path.join(os.path.dirname(__file__), 'translation')
+    DEFAULT_LANGUAGE = 'ru'
+
+    catalogs = {}
+    generation = 0
+    _resolved = {}
 
     @staticmethod
-    def _translate_into_language(message: str, _) -> str:
+    def _build_catalog(_) -> dict[str, str]:
         """Private method that helps gettext to find patterns to translate.
 
         Args:
-            message (str): message to user
+            _ (Callable[[str], str]): gettext function of the language
         Returns:
-            str
+            dict[str, str]: translations of all messages to user
         """
         POSSIBLE_MESSAGES = {
             'Вы превысили лимит сообщений. Подождите': _('Вы превысили лимит сообщений. Подождите'),
             'Добро пожаловать!\nЯ бот, отправляющий расписание ВМК': _('Добро пожаловать!\nЯ бот, отправляющий расписание ВМК'),
             'Для получения расписания введите номер вашей учебной группы': _('Для получения расписания введите номер вашей учебной группы'),
-            '/start - начать работу с ботом\n/help - получить подсказки по командам': _('/start - начать работу с ботом\n/help - получить подсказки по командам'),
+            '/start - начать работу с ботом\n/help - получить подсказки по командам\n'
+            '/subscribe - получать расписание на завтра каждый вечер\n/unsubscribe - отменить подписку':
+                _('/start - начать работу с ботом\n/help - получить подсказки по командам\n'
+                  '/subscribe - получать расписание на завтра каждый вечер\n/unsubscribe - отменить подписку'),
             'Держите ваше расписание на сегодня\n': _('Держите ваше расписание на сегодня\n'),
             'Держите ваше расписание на неделю\n': _('Держите ваше расписание на неделю\n'),
             'Держите ваше расписание на завтра\n': _('Держите ваше расписание на завтра\n'),
@@ -29,6 +45,12 @@ class MessageToUser:
             'Расписание на сегодня  ▶️': _('Расписание на сегодня  ▶️'),
             'Расписание на завтра  ⏩': _('Расписание на завтра  ⏩'),
             'Расписание на неделю  ⏭': _('Расписание на неделю  ⏭'),
+            'Следующая пара  ⏱': _('Следующая пара  ⏱'),
+            'Следующая пара через {minutes} мин.:\n': _('Следующая пара через {minutes} мин.:\n'),
+            'Сегодня больше нет пар 🎉': _('Сегодня больше нет пар 🎉'),
+            'Вы подписались на расписание на завтра, оно будет приходить каждый день в {time}':
+                _('Вы подписались на расписание на завтра, оно будет приходить каждый день в {time}'),
+            'Вы отписались от расписания на завтра': _('Вы отписались от расписания на завтра'),
             'Вернуться назад  ↩️': _('Вернуться назад  ↩️'),
             'Не волнуйтесь, это воскресенье 🥳': _('Не волнуйтесь, это воскресенье 🥳'),
             'Понедельник': _('Понедельник'),
@@ -39,23 +61,57 @@ class MessageToUser:
             'Суббота': _('Суббота')
         }
 
-        if message not in POSSIBLE_MESSAGES:
-            return message
+        return POSSIBLE_MESSAGES
 
-        return POSSIBLE_MESSAGES[message]
+    @staticmethod
+    def load() -> None:
+        """Loads catalogs of all languages from translation directory."""
+        catalogs = {MessageToUser.DEFAULT_LANGUAGE: MessageToUser._build_catalog(lambda message: message)}
+        for language in sorted(os.listdir(MessageToUser.TRANSLATION_PATH)):
+            if gettext.find('user', MessageToUser.TRANSLATION_PATH, languages=[language]):
+                translation = gettext.translation('user', MessageToUser.TRANSLATION_PATH, languages=[language])
+                catalogs[language] = MessageToUser._build_catalog(translation.gettext)
+
+        MessageToUser.catalogs = catalogs
+        MessageToUser._resolved = {}
+        MessageToUser.generation += 1
 
     @staticmethod
-    def translate(message: str, language: str) -> str:
+    def resolve_language(language: str | None) -> str:
+        """Returns loaded language for user's language code.
+
+        Falls back from regional language code to its base language ('en-US' -> 'en')
+        and then to the default language.
+
+        Args:
+            language (str | None): user's language code
+        Returns:
+            str
+        """
+        if language:
+            language = language.replace('-', '_')
+            for candidate in (language, language.lower(), language.split('_')[0].lower()):
+                if candidate in MessageToUser.catalogs:
+                    return candidate
+        return MessageToUser.DEFAULT_LANGUAGE
+
+    @staticmethod
+    def translate(message: str, language: str | None) -> str:
         """Translates message into user's language.
 
         Args:
             message (str): message to user
-            language (str): user's language
+            language (str | None): user's language
         Returns:
             str
         """
-        translation_path = os.path.join(os.path.dirname(__file__), 'translation')
-        translation = gettext.translation('user', translation_path, languages=[language], fallback=True)
-        _ = translation.gettext
+        catalog = MessageToUser._resolved.get(language)
+        if catalog is None:
+            resolved = MessageToUser.resolve_language(language)
+            catalog = MessageToUser.catalogs[resolved]
+            MessageToUser._resolved[language] = catalog
+
+        return catalog.get(message, message)
+
 
-        return MessageToUser._translate_into_language(message, _)
+MessageToUser.load()
@@ -0,0 +1,242 @@
+"""Prometheus metrics of Schedule Telegram bot."""
+
+import bisect
+import logging
+import math
+from typing import Callable, Iterator
+from VMK_bot.cache import LRUCache
+
+log = logging.getLogger(__name__)
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    """Returns sample line in Prometheus text format.
+
+    Args:
+        name (str): sample name
+        labels (dict[str, str]): label values by label names
+        value (float): sample value
+    Returns:
+        str
+    """
+    if labels:
+        escaped = (str(label_value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for label_value in labels.values())
+        name += '{' + ','.join(f'{label}="{label_value}"' for label, label_value in zip(labels, escaped)) + '}'
+    if math.isinf(value):
+        return f'{name} {"+Inf" if value > 0 else "-Inf"}'
+    return f'{name} {value if isinstance(value, int) else float(value)!r}'
+
+
+class Counter:
+    """Monotonic counter with labels.
+
+    Args:
+        name (str): metric name
+        help (str): metric description
+        labels (tuple[str, ...]): label names
+        values (dict[tuple, float]): counted values by label values
+    """
+
+    TYPE = 'counter'
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        """Init method."""
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increments counter.
+
+        Args:
+            labels (str): label values
+            amount (float): increment
+        """
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yields samples as (name, labels, value)."""
+        for labels, value in self.values.items():
+            yield self.name, dict(zip(self.labels, labels)), value
+
+
+class Histogram(Counter):
+    """Histogram of observed values with labels.
+
+    Args:
+        buckets (tuple[float, ...]): upper bounds of buckets
+        values (dict[tuple, list]): number of observations in every bucket, sum and count by label values
+    """
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = BUCKETS) -> None:
+        """Init method."""
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Stores observation.
+
+        Args:
+            value (float): observed value, e.g. latency in seconds
+            labels (str): label values
+        """
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def count(self, *labels: str) -> int:
+        """Returns number of observations.
+
+        Args:
+            labels (str): label values
+        Returns:
+            int
+        """
+        return sum(self.values.get(labels, [0])[:-1])
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yields samples as (name, labels, value)."""
+        for labels, counts in self.values.items():
+            labels = dict(zip(self.labels, labels))
+            total = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                total += count
+                yield f'{self.name}_bucket', labels | {'le': '+Inf' if math.isinf(bound) else repr(bound)}, total
+            yield f'{self.name}_sum', labels, counts[-1]
+            yield f'{self.name}_count', labels, total
+
+
+class Gauge(Counter):
+    """Metric which values are computed by callbacks on every scrape.
+
+    Args:
+        TYPE (str): Prometheus type of metric, gauge or counter
+        values (dict[tuple, Callable[[], float]]): callbacks by label values
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), metric_type: str = 'gauge') -> None:
+        """Init method."""
+        super().__init__(name, help, labels)
+        self.TYPE = metric_type
+
+    def track(self, callback: Callable[[], float], *labels: str) -> None:
+        """Sets callback computing value.
+
+        Args:
+            callback (Callable[[], float]): function returning current value
+            labels (str): label values
+        """
+        self.values[labels] = callback
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yields samples as (name, labels, value)."""
+        for labels, callback in self.values.items():
+            yield self.name, dict(zip(self.labels, labels)), callback()
+
+
+class Metrics:
+    """Singleton registry of bot metrics.
+
+    Metrics are updated from the event loop thread only, so they need no locking.
+
+    Args:
+        handler_seconds (Histogram): latency of update processing by handler, 'throttled' for updates rejected by antiflood
+        requests (Counter): number of processed updates by handler, 'throttled' for updates rejected by antiflood
+        throttled (Counter): number of updates rejected by antiflood
+        db_seconds (Histogram): latency of database calls by kind (read/write) and function
+        api_seconds (Histogram): latency of Telegram Bot API requests by method
+        broadcast (Counter): number of broadcast messages by result (sent/failed)
+        outbox (Counter): number of outgoing messages by result (sent/coalesced/retried/failed/blocked)
+        outbox_seconds (Histogram): time from queueing message to its delivery
+        outbox_depth (Gauge): number of queued messages
+        families (list[Counter]): all registered metrics in order of rendering
+    """
+
+    def __new__(cls):
+        """Method new."""
+        if not hasattr(cls, 'instance'):
+            cls.instance = super().__new__(cls)
+            cls.instance._init_metrics()
+        return cls.instance
+
+    def _init_metrics(self) -> None:
+        """Creates metrics."""
+        self.handler_seconds = Histogram('vmk_handler_seconds', 'Latency of update processing.', ('handler',))
+        self.requests = Counter('vmk_requests_total', 'Processed updates.', ('handler',))
+        self.throttled = Counter('vmk_throttled_total', 'Updates rejected by antiflood.')
+        self.db_seconds = Histogram('vmk_db_seconds', 'Latency of database calls.', ('kind', 'function'))
+        self.api_seconds = Histogram('vmk_telegram_api_seconds', 'Latency of Telegram Bot API requests.', ('method',))
+        self.broadcast = Counter('vmk_broadcast_messages_total', 'Messages of daily broadcast by result.', ('result',))
+        self.outbox = Counter('vmk_outbox_messages_total', 'Outgoing messages by result of sending.', ('result',))
+        self.outbox_seconds = Histogram('vmk_outbox_seconds', 'Time from queueing message to its delivery.')
+        self.outbox_depth = Gauge('vmk_outbox_depth', 'Messages waiting to be sent.')
+        self._cache_hits = Gauge('vmk_cache_hits_total', 'Cache lookups that found value.', ('cache',), 'counter')
+        self._cache_misses = Gauge('vmk_cache_misses_total', 'Cache lookups of missing keys.', ('cache',), 'counter')
+        self._cache_ratio = Gauge('vmk_cache_hit_ratio', 'Share of cache lookups that found value.', ('cache',))
+        self._cache_entries = Gauge('vmk_cache_entries', 'Number of cached entries.', ('cache',))
+        self.families = [self.handler_seconds, self.requests, self.throttled, self.db_seconds, self.api_seconds, self.broadcast,
+                         self.outbox, self.outbox_seconds, self.outbox_depth,
+                         self._cache_hits, self._cache_misses, self._cache_ratio, self._cache_entries]
+        self._runner = None
+
+    def track_cache(self, name: str, cache: LRUCache) -> None:
+        """Exports hits, misses, hit ratio and size of cache.
+
+        Args:
+            name (str): value of label cache
+            cache (LRUCache): tracked cache
+        """
+        self._cache_hits.track(lambda: cache.hits, name)
+        self._cache_misses.track(lambda: cache.misses, name)
+        self._cache_ratio.track(lambda: cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else 0.0, name)
+        self._cache_entries.track(lambda: len(cache), name)
+
+    def render(self) -> str:
+        """Returns all metrics in Prometheus text format.
+
+        Returns:
+            str
+        """
+        lines = []
+        for metric in self.families:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+            lines.extend(format_sample(*sample) for sample in metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    async def serve(self, host: str, port: int) -> None:
+        """Starts HTTP endpoint /metrics in the running event loop, the bot works without it if the port is busy.
+
+        Args:
+            host (str): address to listen on
+            port (int): port to listen on
+        """
+        from aiohttp import web  # imported here, so schedule import doesn't load the web server
+
+        async def handle(_: web.Request) -> web.Response:
+            return web.Response(text=self.render(), headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+        app = web.Application()
+        app.router.add_get('/metrics', handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, host, port).start()
+        except OSError as error:
+            await self.stop()
+            log.warning('Metrics are not served, %s:%s is unavailable: %s', host, port, error)
+            return
+        print(f'Metrics are served on http://{host}:{port}/metrics')
+
+    async def stop(self) -> None:
+        """Stops HTTP endpoint."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
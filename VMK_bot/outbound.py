@@ -0,0 +1,269 @@
+"""Outbound message pipeline for Schedule Telegram bot."""
+
+import asyncio
+import collections
+import itertools
+import logging
+import time
+from aiogram import Bot
+from aiogram.utils.exceptions import ChatNotFound, NetworkError, RestartingTelegram, RetryAfter, TelegramAPIError, Unauthorized
+from VMK_bot.metrics import Metrics
+
+log = logging.getLogger(__name__)
+
+
+class OutgoingMessage:
+    """Message waiting to be sent.
+
+    Args:
+        chat_id (int): chat id
+        text (str): text of message
+        kwargs (dict): other arguments of Bot.send_message
+        queued (float): time of queueing from time.perf_counter
+    """
+
+    __slots__ = ('chat_id', 'text', 'kwargs', 'queued')
+
+    def __init__(self, chat_id: int, text: str, kwargs: dict) -> None:
+        """Init method."""
+        self.chat_id = chat_id
+        self.text = text
+        self.kwargs = kwargs
+        self.queued = time.perf_counter()
+
+
+class Outbox:
+    """Sends all messages of the bot in background, so handlers don't wait for Telegram.
+
+    Chats with pending replies are served by a fixed number of workers, which caps concurrent
+    requests to Bot API. A chat is served by one worker at a time, so replies to it keep their order.
+    Consecutive replies to the same chat that are queued while it waits are sent as one message
+    if they differ only in text. Bulk messages, e.g. daily broadcast, are sent by the same workers
+    when no replies are waiting. All requests share one rate limit and messages to the same chat are sent
+    at least chat_interval seconds apart. On RetryAfter every worker waits the requested time,
+    network errors are retried with exponential backoff.
+
+    Args:
+        bot (Bot): bot sending messages
+        workers (int): maximum number of concurrent requests
+        rate (float | None): maximum number of messages per second, None disables the limit
+        chat_interval (float): minimal time in seconds between messages to the same chat
+        retries (int): attempts to resend message after network error
+        backoff (float): delay before the first resend in seconds, doubled on every attempt
+        separator (str): text between coalesced messages
+    """
+
+    MAX_LENGTH = 4096  # maximum length of message text in Telegram
+    REPLY, BULK = 0, 1  # priorities of queued chats and bulk messages
+    MIN_PRUNE = 1024  # number of remembered chats which triggers removal of stale ones
+
+    def __init__(self, bot: Bot, workers: int = 8, rate: float | None = 25.0, chat_interval: float = 1.0, retries: int = 3,
+                 backoff: float = 0.5, separator: str = '\n\n') -> None:
+        """Init method."""
+        self.bot = bot
+        self.workers = workers
+        self.rate = rate
+        self.chat_interval = chat_interval
+        self.retries = retries
+        self.backoff = backoff
+        self.separator = separator
+        self._chats = {}  # chat id -> deque of replies, chat is present while it's queued or served
+        self._bulk = collections.deque()  # bulk messages and futures of their results
+        self._ready = None  # (priority, sequence number, chat id or None for bulk message)
+        self._sequence = itertools.count()
+        self._next_send = 0.0
+        self._last_sent = {}  # chat id -> time of the last sent or reserved message
+        self._prune_size = Outbox.MIN_PRUNE
+        self._tasks = []
+        self._pending = 0
+
+    def __len__(self) -> int:
+        """Len method."""
+        return self._pending
+
+    def send(self, chat_id: int, text: str, **kwargs) -> None:
+        """Queues message, messages queued before start are sent after it.
+
+        Args:
+            chat_id (int): chat id
+            text (str): text of message
+            kwargs: other arguments of Bot.send_message
+        """
+        messages = self._chats.get(chat_id)
+        if messages is None:
+            messages = self._chats[chat_id] = collections.deque()
+            if self._ready is not None:
+                self._ready.put_nowait((Outbox.REPLY, next(self._sequence), chat_id))
+        messages.append(OutgoingMessage(chat_id, text, kwargs))
+        self._pending += 1
+
+    def send_bulk(self, chat_id: int, text: str, **kwargs) -> asyncio.Future:
+        """Queues message of mass mailing, workers take it only when no replies are waiting.
+
+        Bulk messages aren't coalesced and aren't ordered with replies to the same chat.
+
+        Args:
+            chat_id (int): chat id
+            text (str): text of message
+            kwargs: other arguments of Bot.send_message
+        Returns:
+            asyncio.Future: 'sent', 'failed' or 'blocked' if chat can't receive messages, e.g. blocked the bot
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._bulk.append((OutgoingMessage(chat_id, text, kwargs), future))
+        if self._ready is not None:
+            self._ready.put_nowait((Outbox.BULK, next(self._sequence), None))
+        self._pending += 1
+        return future
+
+    def _mergeable(self, first: OutgoingMessage, second: OutgoingMessage) -> bool:
+        """Checks if two consecutive messages can be sent as one, keeping keyboard of the second."""
+        return all((first.kwargs.keys() <= {'parse_mode', 'reply_markup'}, second.kwargs.keys() <= {'parse_mode', 'reply_markup'},
+                    first.kwargs.get('parse_mode') == second.kwargs.get('parse_mode'),
+                    first.kwargs.get('reply_markup') in (None, second.kwargs.get('reply_markup')),
+                    len(first.text) + len(self.separator) + len(second.text) <= Outbox.MAX_LENGTH))
+
+    def _next_message(self, messages: collections.deque) -> tuple[OutgoingMessage, int]:
+        """Takes message from chat's queue, coalescing following messages into it.
+
+        Args:
+            messages (collections.deque): queued messages of chat
+        Returns:
+            tuple[OutgoingMessage, int]: message and number of coalesced messages
+        """
+        message = messages.popleft()
+        count = 1
+        while messages and self._mergeable(message, messages[0]):
+            following = messages.popleft()
+            following.text = message.text + self.separator + following.text
+            following.queued = message.queued
+            message = following
+            count += 1
+        return message, count
+
+    async def _wait_turn(self) -> None:
+        """Waits for the next request allowed by rate limit and pause requested by Telegram."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        turn = max(self._next_send, now)
+        self._next_send = turn + (1 / self.rate if self.rate else 0.0)
+        if turn > now:
+            await asyncio.sleep(turn - now)
+
+    async def _wait_chat(self, chat_id: int) -> None:
+        """Waits until chat_interval passes since the previous message to chat, reserving time of the next one."""
+        if not self.chat_interval:
+            return
+        now = asyncio.get_running_loop().time()
+        if len(self._last_sent) >= self._prune_size:
+            self._last_sent = {chat: last for chat, last in self._last_sent.items() if last + self.chat_interval > now}
+            self._prune_size = max(Outbox.MIN_PRUNE, 2 * len(self._last_sent))
+
+        turn = max(self._last_sent.get(chat_id, now - self.chat_interval) + self.chat_interval, now)
+        self._last_sent[chat_id] = turn
+        if turn > now:
+            await asyncio.sleep(turn - now)
+
+    async def _deliver(self, message: OutgoingMessage) -> str:
+        """Sends message, retrying it if Telegram asks to or request fails.
+
+        Returns:
+            str: 'sent', 'failed' or 'blocked'
+        """
+        metrics = Metrics()
+        attempt = 0
+        while True:
+            await self._wait_chat(message.chat_id)
+            await self._wait_turn()
+            try:
+                await self.bot.send_message(message.chat_id, message.text, **message.kwargs)
+                return 'sent'
+            except RetryAfter as error:
+                metrics.outbox.inc('retried')
+                self._next_send = max(self._next_send, asyncio.get_running_loop().time() + error.timeout)
+            except (Unauthorized, ChatNotFound):
+                return 'blocked'
+            except (NetworkError, RestartingTelegram):
+                if attempt >= self.retries:
+                    log.exception('Failed to send message to chat %s', message.chat_id)
+                    return 'failed'
+                metrics.outbox.inc('retried')
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+            except TelegramAPIError:
+                log.exception('Failed to send message to chat %s', message.chat_id)
+                return 'failed'
+
+    async def _send(self, message: OutgoingMessage, count: int = 1) -> str:
+        """Sends message and records its result.
+
+        Args:
+            message (OutgoingMessage): message
+            count (int): number of queued messages coalesced into it
+        Returns:
+            str: 'sent', 'failed' or 'blocked'
+        """
+        metrics = Metrics()
+        try:
+            result = await self._deliver(message)
+        except Exception:
+            log.exception('Failed to send message to chat %s', message.chat_id)
+            result = 'failed'
+        self._pending -= count
+        metrics.outbox.inc(result)
+        metrics.outbox.inc('coalesced', amount=count - 1)
+        metrics.outbox_seconds.observe(time.perf_counter() - message.queued)
+        return result
+
+    async def _work(self) -> None:
+        """Serves chats with queued replies one by one, sends bulk messages when no replies are waiting."""
+        while True:
+            _, _, chat_id = await self._ready.get()
+            try:
+                if chat_id is None:
+                    message, future = self._bulk.popleft()
+                    result = await self._send(message)
+                    if not future.done():
+                        future.set_result(result)
+                    continue
+                messages = self._chats[chat_id]
+                try:
+                    while messages:
+                        await self._send(*self._next_message(messages))
+                finally:
+                    del self._chats[chat_id]
+            finally:
+                self._ready.task_done()
+
+    async def join(self) -> None:
+        """Waits until all queued messages are sent, outbox is supposed to be started."""
+        await self._ready.join()
+
+    def start(self) -> None:
+        """Starts workers."""
+        if not self._tasks:
+            self._ready = asyncio.PriorityQueue()
+            for chat_id in self._chats:
+                self._ready.put_nowait((Outbox.REPLY, next(self._sequence), chat_id))
+            for _ in self._bulk:
+                self._ready.put_nowait((Outbox.BULK, next(self._sequence), None))
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Sends queued messages and stops workers.
+
+        Args:
+            timeout (float): maximum time in seconds to wait for queued messages
+        """
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            log.warning('%d queued messages are not sent', len(self))
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._ready = None
+        self._pending = sum(len(messages) for messages in self._chats.values()) + len(self._bulk)
@@ -1,249 +1,178 @@
 """Module for parsing pdf tables and saving data into database."""
 
 import camelot
-import shlex
+import numpy as np
+import pandas as pd
+import pypdf
+from concurrent.futures import ProcessPoolExecutor
 from VMK_bot.database import Database
-import json
-from datetime import datetime
-from VMK_bot.messageUI import MessageToUser
+from VMK_bot.lessons import Lesson, NormalLesson, DoubleLesson
+from VMK_bot.schedule import Schedule
 
 
-class Lesson:
-    """Lesson class to be inherited.
+class Parser(Schedule):
+    """PDF table parser, which can transform it into database.
 
-    Args:
-        start_time (str): Class start time
-        end_time (str): Class finish time
+    Only this module imports camelot, so the bot loads it just to import new tables
     """
 
-    start_time = None
-    end_time = None
-
-
-class NormalLesson(Lesson):
-    """Normal lesson.
-
-    Args:
-        description (str): text that describes normal lesson
-    """
-
-    CODE = "0"
-    description = None
-
-    def __init__(self, start_time: str, end_time: str, description: str) -> None:
-        """Init method."""
-        self.start_time = start_time
-        self.end_time = end_time
-        self.description = description
-
-    def __str__(self) -> str:
-        """Str method."""
-        return f"{self.CODE} {self.start_time} {self.end_time} '{self.description}'"
-
-
-class DoubleLesson(Lesson):
-    """Odd/even week lesson.
-
-    Args:
-        description_up (str): description for a odd week lesson
-        description_down (str): description for a even week lesson
-    """
-
-    CODE = "1"
-    description_up = None
-    description_down = None
-
-    def __init__(self, start_time: str, end_time: str, description_up: str, description_down: str) -> None:
-        """Init method."""
-        self.start_time = start_time
-        self.end_time = end_time
-        self.description_up = description_up
-        self.description_down = description_down
+    @staticmethod
+    def parse_schedule(filename_pdf: str, jobs: int = 1) -> dict:
+        """Static method that extract data from pdf table.
 
-    def __str__(self) -> str:
-        """Str method."""
-        return f"{self.CODE} {self.start_time} {self.end_time} '{self.description_up}' '{self.description_down}'"
+        Every page has its own header of groups, so with jobs > 1 the table is split into
+        ranges of pages which are parsed in worker processes and merged in order of pages.
 
+        Args:
+            filename_pdf (str): name of pdf table file
+            jobs (int): number of worker processes
+        Returns:
+            dict: Data from parsed schedule
+        """
+        if jobs <= 1:
+            return Parser.parse_pages(filename_pdf, 'all')
 
-class Parser:
-    """PDF table parser, which can transform it into database."""
+        page_ranges = Parser.split_pages(len(pypdf.PdfReader(filename_pdf).pages), jobs)
+        with ProcessPoolExecutor(max_workers=len(page_ranges)) as pool:
+            results = pool.map(Parser.parse_pages, [filename_pdf] * len(page_ranges), page_ranges)
 
-    WEEKDAYS = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота")
+        data = {}
+        for part in results:
+            data |= part
+        return data
 
     @staticmethod
-    def number_to_weekday(number: int) -> str:
-        """Returns string repr of weekday by its number.
+    def split_pages(pages: int, parts: int) -> list[str]:
+        """Splits pages into contiguous ranges of nearly equal size.
 
         Args:
-            number (int): number of weekday
+            pages (int): number of pages
+            parts (int): maximum number of ranges
         Returns:
-            str
+            list[str]: ranges in camelot format, e.g. ['1-3', '4-5']
         """
-        if number == 6:
-            return 'Воскресенье'
-        return Parser.WEEKDAYS[number]
+        parts = max(1, min(parts, pages))
+        bounds = [pages * i // parts for i in range(parts + 1)]
+        return [f'{first + 1}-{last}' if last > first + 1 else f'{last}' for first, last in zip(bounds, bounds[1:])]
 
     @staticmethod
-    def parse_schedule(filename_pdf: str) -> dict:
-        """Static method that extract data from pdf table.
+    def parse_pages(filename_pdf: str, pages: str) -> dict:
+        """Static method that extract data from given pages of pdf table.
 
         Args:
             filename_pdf (str): name of pdf table file
+            pages (str): pages in camelot format, e.g. '1-3' or 'all'
         Returns:
-            dict: Data from parsed schedule
+            dict: Data from parsed pages
         """
         data = {}
 
         # extracting tables from pdf
-        tables = camelot.read_pdf(filename_pdf, line_scale=110, copy_text=['v', 'h'], pages='all')
+        tables = camelot.read_pdf(filename_pdf, line_scale=110, copy_text=['v', 'h'], pages=pages)
         for page in tables:
-            df = page.df
-            if df[0][0] not in Parser.WEEKDAYS:
-                df = df.iloc[1:, :]
-                df.index = range(len(df))
-            if df.iloc[0, -1] in Parser.WEEKDAYS:  # removing double dates
-                df = df.iloc[:, :-1]
-            i, group_number_filled = 0, False
-            current_weekday, groups = None, None
-            while i < df.shape[0]:
-                match df[0][i].split("-"):
-                    case [week_day] if week_day in Parser.WEEKDAYS:
-                        if not group_number_filled:
-                            data |= {group_number:
-                                     {day: [] for day in Parser.WEEKDAYS} for group_number in df.loc[i, 1:]}
-                            groups = [group_number for group_number in df.loc[i, 1:]]
-                            group_number_filled = True
-                        current_weekday = week_day
-                    case [start_time, end_time]:
-                        if i + 1 < df.shape[0] and df[0][i] == df[0][i + 1]:
-                            for group_number, lesson_up, lesson_down in zip(groups, df.loc[i, 1:], df.loc[i + 1, 1:]):
-                                if lesson_up == lesson_down:
-                                    data[group_number][current_weekday].append(
-                                        str(NormalLesson(start_time, end_time, lesson_up)))
-                                else:
-                                    data[group_number][current_weekday].append(
-                                        str(DoubleLesson(start_time, end_time, lesson_up, lesson_down)))
-                            i += 1
-                        else:
-                            for group_number, lesson in zip(groups, df.loc[i, 1:]):
-                                data[group_number][current_weekday].append(
-                                    str(NormalLesson(start_time, end_time, lesson)))
-                    case _:
-                        pass
-                i += 1
+            data |= Parser.interpret_table(page.df)
 
         return data
 
     @staticmethod
-    def import_schedule_to_database(filename_pdf: str) -> None:
-        """Static method that imports given pdf table into database.
-
-        Args:
-            filename_pdf (str): name of pdf table file
-        """
-        data = Parser.parse_schedule(filename_pdf)
-
-        # import schedule into database
-        db = Database()
-        db.connect()
-
-        valid_characters = set("0123456789/")  # valid characters in group number
-        for group_number in data.keys():
-            if set(group_number) <= valid_characters:
-                for parity in [False, True]:
-                    table_entry = list()
-                    for weekday in Parser.WEEKDAYS:
-                        table_entry.append(Parser.get_schedule_day(data, group_number, parity, weekday))
-                    db.update_schedule(group_number, parity, table_entry)
+    def interpret_table(df: pd.DataFrame) -> dict:
+        """Static method that extracts lessons of all groups from one table.
 
-    @staticmethod
-    def mark_day_schedule(day_schedule: list[str], tomorrow: bool) -> list[str]:
-        """Marks lessons as passed (red), in progress (yellow) and will be (green).
+        Rows are classified by their first cell, weekdays are forward-filled from weekday rows and
+        two adjacent rows with the same time are merged into one row of lessons, which are
+        odd/even week lessons where the rows differ.
 
         Args:
-            day_schedule (list[str]): list of all lessons for the day
-            tomorrow (bool): True if this request not for today and shouldn't be marked
+            df (pd.DataFrame): table extracted by camelot
         Returns:
-            list[str]
+            dict: Data from parsed table
         """
-        MARKS = {'after': '🔴', 'during': '🟡', 'before': '🟢'}
+        if df[0][0] not in Parser.WEEKDAYS:
+            df = df.iloc[1:, :]
+            df.index = range(len(df))
+        if df.iloc[0, -1] in Parser.WEEKDAYS:  # removing double dates
+            df = df.iloc[:, :-1]
+
+        first = df[0]
+        is_weekday = first.isin(Parser.WEEKDAYS)
+        if not is_weekday.any():
+            return {}
+
+        groups = df.iloc[is_weekday.argmax(), 1:].tolist()
+        data = {group_number: {day: [] for day in Parser.WEEKDAYS} for group_number in groups}
+
+        times = first.str.extract(Lesson.TIME_RANGE)
+        weekdays = first.where(is_weekday).ffill()
+        position = first.groupby((first != first.shift()).cumsum()).cumcount()  # position among rows with the same time
+        lesson_rows = (times[0].notna() & weekdays.notna() & (position % 2 == 0)).to_numpy()
+        paired = first.eq(first.shift(-1)).to_numpy()[lesson_rows]
+        rows = np.flatnonzero(lesson_rows)
+        if not len(rows):
+            return data
+
+        cells = df.iloc[:, 1:].to_numpy()
+        up, down = cells[rows], cells[np.where(paired, rows + 1, rows)]
+        double = up != down
+
+        minutes = times.iloc[rows].astype(int).to_numpy()
+        starts, ends = minutes[:, 0] * 60 + minutes[:, 1], minutes[:, 2] * 60 + minutes[:, 3]
+        weekdays = weekdays.iloc[rows]
+
+        # groups can repeat in the header, then every column adds its own lesson to the same day
+        columns = pd.Series(groups)
+        repeats = columns.map(columns.value_counts()).to_numpy()
+        occurrence = columns.groupby(columns).cumcount().to_numpy() + 1
+        slots = weekdays.groupby(weekdays).cumcount().to_numpy()[:, None] * repeats + occurrence
+
+        for weekday, start, end, row_up, row_down, row_double, row_slots in zip(
+                weekdays.tolist(), starts.tolist(), ends.tolist(), up.tolist(), down.tolist(), double.tolist(), slots.tolist()):
+            for group_number, lesson_up, lesson_down, is_double, slot in zip(groups, row_up, row_down, row_double, row_slots):
+                if is_double:
+                    data[group_number][weekday].append(DoubleLesson(slot, start, end, lesson_up, lesson_down))
+                else:
+                    data[group_number][weekday].append(NormalLesson(slot, start, end, lesson_up))
 
-        marked = list()
-        for i, lesson in enumerate(day_schedule, 1):
-            _, start_time, end_time, description = shlex.split(lesson)
-
-            mark = ''
-            if not tomorrow:
-                start_hour, start_minute = map(int, start_time.split('.'))
-                end_hour, end_minute = map(int, end_time.split('.'))
-
-                now = datetime.now()
-                start = now.replace(hour=start_hour, minute=start_minute, second=0)
-                end = now.replace(hour=end_hour, minute=end_minute, second=0)
-
-                mark = MARKS['during'] if start <= now <= end else MARKS['before'] if now < start else MARKS['after']
-
-            if description:
-                marked.append(Parser._pretty_lesson_str(i, start_time, end_time, description) + ' ' + mark)
-
-        return marked
+        return data
 
     @staticmethod
-    def get_today_schedule(group_number: str, parity: bool, weekday: str, language: str) -> str:
-        """Returns today's schedule for user.
+    def import_schedule_to_database(filename_pdf: str) -> None:
+        """Static method that imports given pdf table into database.
 
         Args:
-            group_number (str): user's group
-            parity (bool): parity of the week
-            weekday (str): day of the week
-            language (str): user's language
-        Returns:
-            str
+            filename_pdf (str): name of pdf table file
         """
-        if weekday == 'Воскресенье':
-            return 'Не волнуйтесь, это воскресенье 🥳'
-
-        db = Database()
-        db.connect()
-
-        today_schedule = db.get_schedule(group_number, parity, weekday)
-        tomorrow = Parser.number_to_weekday(datetime.today().weekday()) != weekday  # True if this request not for today
-        today_schedule = Parser.mark_day_schedule(json.loads(today_schedule), tomorrow=tomorrow)
-
-        return '\n'.join([f'<b>{MessageToUser.translate(weekday, language)}</b>'] + today_schedule)
+        Parser.save_schedule_to_database(Parser.parse_schedule(filename_pdf), filename_pdf)
 
     @staticmethod
-    def get_week_schedule(group_number: str, parity: bool, language: str) -> str:
-        """Returns week's schedule for user.
+    def save_schedule_to_database(data: dict[str, dict[str, list[Lesson]]], source: str) -> int:
+        """Static method that imports parsed schedule into database as a new schedule version and renders its replies.
 
         Args:
-            group_number (str): user's group
-            parity (bool): parity of the week
-            language (str): user's language
+            data: schedule data returned by parse_schedule
+            source (str): name of pdf table file
         Returns:
-            str
+            int: number of imported schedule version
         """
         db = Database()
         db.connect()
 
-        week_schedule = ''
-        for weekday in Parser.WEEKDAYS:
-            schedule_list = db.get_schedule(group_number, parity, weekday)
-            schedule_list = json.loads(schedule_list)
-
-            day_schedule = f'<b>{MessageToUser.translate(weekday, language)}</b>\n'
-            for i, lesson in enumerate(schedule_list, 1):
-                _, start_time, end_time, description = shlex.split(lesson)
-                if description:
-                    day_schedule += Parser._pretty_lesson_str(i, start_time, end_time, description) + '\n'
-
-            week_schedule += day_schedule
+        lessons = list()
+        valid_characters = set("0123456789/")  # valid characters in group number
+        for group_number in data.keys():
+            if set(group_number) <= valid_characters:
+                for parity in [False, True]:
+                    for weekday, day in enumerate(Parser.WEEKDAYS):
+                        lessons.extend((group_number, parity, weekday, lesson)
+                                       for lesson in Parser.get_schedule_day(data, group_number, parity, day) if lesson.description)
+        version = db.import_schedule(source, lessons)
+        Parser.prerender(sorted({group_number for group_number, *_ in lessons}))
 
-        return week_schedule
+        Parser.invalidate()
+        return version
 
     @staticmethod
-    def get_schedule_day(data: dict['str', 'str'], group_number: str, odd_week: bool, day: str) -> str:
-        """Return schedule of chosen group on day in json format.
+    def get_schedule_day(data: dict[str, dict[str, list[Lesson]]], group_number: str, odd_week: bool, day: str) -> list[NormalLesson]:
+        """Return schedule of chosen group on day.
 
         Args:
             data: schedule data
@@ -251,28 +180,7 @@ class Parser:
             odd_week (bool): is current week odd or even?
             day (str): day of the week
         Returns:
-            str: schedule on day
+            list[NormalLesson]: schedule on day
         """
-        data = data[group_number][day]
-
-        res = list()
-        for i, lesson in enumerate(data, 1):
-            match shlex.split(lesson):
-                case [NormalLesson.CODE, start_time, end_time, description]:
-                    res.append(str(NormalLesson(start_time, end_time, description)))
-                case [DoubleLesson.CODE, start_time, end_time, _, description] if odd_week:
-                    res.append(str(NormalLesson(start_time, end_time, description)))
-                case [DoubleLesson.CODE, start_time, end_time, description, _] if not odd_week:
-                    res.append(str(NormalLesson(start_time, end_time, description)))
-                case _:
-                    pass
-
-        return json.dumps(res)
-
-    @staticmethod
-    def _pretty_lesson_str(i: int, start_time: str, end_time: str, description: str):
-        """Used for string formatting."""
-        if description:
-            description = " ".join(description.replace('\n', ' ').split())
-            return f"{i}) ({start_time}-{end_time}) {description}"
-        return ""
+        return [lesson.for_week(odd_week) if isinstance(lesson, DoubleLesson) else lesson
+                for lesson in data[group_number][day]]
@@ -0,0 +1,218 @@
+"""Hot reload of schedule pdf tables for Schedule Telegram bot."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import fnmatch
+import glob
+import inspect
+import logging
+import multiprocessing
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable
+from VMK_bot import extract_tables
+from VMK_bot.database import Database
+
+log = logging.getLogger(__name__)
+
+
+class DirectoryWatcher:
+    """Notifies about written or moved in files of directory.
+
+    Uses inotify on Linux, so changes are noticed at once without scanning directory,
+    and polls modification times of files elsewhere.
+
+    Args:
+        directory (str): watched directory
+        pattern (str): pattern of watched file names
+        interval (float): polling interval in seconds
+        inotify (bool): True if inotify is used
+    """
+
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_TO = 0x80
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT = struct.Struct('iIII')  # wd, mask, cookie, length of name
+
+    def __init__(self, directory: str, pattern: str = '*.pdf', interval: float = 5.0) -> None:
+        """Init method."""
+        self.directory = directory
+        self.pattern = pattern
+        self.interval = interval
+        self.inotify = False
+        self._changed = asyncio.Event()
+        self._fd = None
+        self._task = None
+
+    def _init_inotify(self) -> int | None:
+        """Returns inotify file descriptor watching directory, None if inotify isn't available."""
+        name = ctypes.util.find_library('c')
+        if not name:
+            return None
+        libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            return None
+
+        fd = libc.inotify_init1(DirectoryWatcher.IN_NONBLOCK | DirectoryWatcher.IN_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), DirectoryWatcher.IN_CLOSE_WRITE | DirectoryWatcher.IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _read_events(self) -> None:
+        """Reads inotify events and notifies about changes of watched files."""
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(buffer):
+                _, _, _, length = DirectoryWatcher.EVENT.unpack_from(buffer, offset)
+                offset += DirectoryWatcher.EVENT.size
+                name = os.fsdecode(buffer[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if fnmatch.fnmatch(name, self.pattern):
+                    self._changed.set()
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        """Returns size and modification time of watched files."""
+        snapshot = dict()
+        for path in glob.glob(os.path.join(self.directory, self.pattern)):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    async def _poll(self) -> None:
+        """Polls directory and notifies about changed files."""
+        loop = asyncio.get_running_loop()
+        previous = await loop.run_in_executor(None, self._snapshot)
+        while True:
+            await asyncio.sleep(self.interval)
+            current = await loop.run_in_executor(None, self._snapshot)
+            if current.items() - previous.items():
+                self._changed.set()
+            previous = current
+
+    def start(self) -> None:
+        """Starts watching directory."""
+        if self._fd is not None or self._task is not None:
+            return
+        self._fd = self._init_inotify()
+        self.inotify = self._fd is not None
+        if self.inotify:
+            asyncio.get_running_loop().add_reader(self._fd, self._read_events)
+        else:
+            self._task = asyncio.create_task(self._poll())
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Waits for change of watched files.
+
+        Args:
+            timeout (float | None): maximum time to wait in seconds
+        Returns:
+            bool: False if nothing changed during timeout
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+    async def stop(self) -> None:
+        """Stops watching directory."""
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class ScheduleReloader:
+    """Imports changed pdf tables while the bot is running.
+
+    Tables are parsed and written into database in a worker process, so the event loop keeps serving
+    updates and the bot never imports camelot. Database switches to the new schedule in one transaction,
+    after that on_reload drops in-memory caches of the old schedule.
+
+    Args:
+        directory (str): directory with pdf tables
+        on_reload (Callable[[], Awaitable[None] | None]): called after tables are imported, awaited if it's a coroutine function
+        debounce (float): time in seconds without changes before import, lets files be copied completely
+        interval (float): polling interval in seconds if inotify isn't available
+        watcher (DirectoryWatcher): watcher of directory
+    """
+
+    def __init__(self, directory: str = 'schedule_tables', on_reload: Callable[[], Awaitable[None] | None] | None = None,
+                 debounce: float = 2.0, interval: float = 5.0) -> None:
+        """Init method."""
+        self.directory = directory
+        self.on_reload = on_reload
+        self.debounce = debounce
+        self.watcher = DirectoryWatcher(directory, interval=interval)
+        self._pool = None
+        self._task = None
+
+    async def reload(self) -> list[str]:
+        """Imports changed pdf tables.
+
+        Returns:
+            list[str]: imported pdf tables
+        """
+        loop = asyncio.get_running_loop()
+        imported = await loop.run_in_executor(self._pool, extract_tables.reload_tables, self.directory,
+                                              os.path.abspath(Database.PATH))
+        if imported and self.on_reload is not None:
+            result = self.on_reload()
+            if inspect.isawaitable(result):
+                await result
+        return imported
+
+    async def _run(self) -> None:
+        """Imports tables after every change of directory."""
+        while True:
+            await self.watcher.wait()
+            while await self.watcher.wait(self.debounce):  # wait until files are written
+                pass
+            try:
+                imported = await self.reload()
+                if imported:
+                    print(f"Reloaded schedule from {', '.join(imported)}")
+            except Exception:
+                log.exception('Failed to reload schedule')
+
+    def start(self) -> None:
+        """Starts watching directory."""
+        if self._task is None:
+            # spawn, so worker process doesn't inherit threads of the bot
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+            self.watcher.start()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops watching directory and waits for running import."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.watcher.stop()
+            await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown)
+            self._pool = None
@@ -0,0 +1,304 @@
+"""Rendering of schedules stored in database for Schedule Telegram bot."""
+
+import bisect
+import json
+import math
+from datetime import datetime
+from VMK_bot.cache import LRUCache
+from VMK_bot.database import Database
+from VMK_bot.lessons import WEEKDAYS
+from VMK_bot.messageUI import MessageToUser
+
+
+class Timeline:
+    """Start and end minutes of day's lessons, which follow each other without overlapping.
+
+    Lessons are classified by binary search, so marking the day or finding the next lesson
+    takes one clock reading and O(log n) comparisons.
+
+    Args:
+        starts (list[int]): start minutes of lessons in increasing order
+        ends (list[int]): end minutes of lessons in increasing order
+    """
+
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals: list[tuple[int, int]]) -> None:
+        """Init method."""
+        self.starts = [start for start, _ in intervals]
+        self.ends = [end for _, end in intervals]
+
+    def classify(self, now: float) -> tuple[int, int]:
+        """Splits lessons into passed, in progress and upcoming ones.
+
+        Args:
+            now (float): minute of the day
+        Returns:
+            tuple[int, int]: number of passed lessons and index of the first upcoming lesson
+        """
+        return bisect.bisect_left(self.ends, now), bisect.bisect_right(self.starts, now)
+
+    def next_lesson(self, now: float) -> int | None:
+        """Returns index of the first lesson starting after now.
+
+        Args:
+            now (float): minute of the day
+        Returns:
+            int | None: None if there are no more lessons today
+        """
+        upcoming = bisect.bisect_right(self.starts, now)
+        return upcoming if upcoming < len(self.starts) else None
+
+
+class Schedule:
+    """Renders replies with schedules, reading lessons from database.
+
+    Replies are rendered for every language right after import and stored in database,
+    so serving a reply takes one lookup of finished text and only time-dependent marks are added.
+
+    Args:
+        rendered (LRUCache): rendered schedules by (generation, group, parity, weekday, language),
+                             'week' is used as weekday for the week's schedule
+        generation (int): number of invalidations, schedules loaded before invalidation are never read from cache
+    """
+
+    WEEKDAYS = WEEKDAYS
+
+    rendered = LRUCache(maxsize=4096)
+    generation = 0
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drops rendered schedules, e.g. after a new schedule is imported."""
+        Schedule.generation += 1
+        Schedule.rendered.clear()
+
+    @staticmethod
+    def number_to_weekday(number: int) -> str:
+        """Returns string repr of weekday by its number.
+
+        Args:
+            number (int): number of weekday
+        Returns:
+            str
+        """
+        if number == 6:
+            return 'Воскресенье'
+        return Schedule.WEEKDAYS[number]
+
+    @staticmethod
+    def minute_of_day(now: datetime) -> float:
+        """Returns minutes passed since midnight.
+
+        Args:
+            now (datetime): current time
+        Returns:
+            float
+        """
+        return now.hour * 60 + now.minute + now.second / 60
+
+    @staticmethod
+    def mark_day_schedule(lessons: list[str], timeline: Timeline, now: float | None) -> list[str]:
+        """Marks lessons as passed (red), in progress (yellow) and will be (green).
+
+        Args:
+            lessons (list[str]): rendered lessons for the day
+            timeline (Timeline): start and end minutes of lessons
+            now (float | None): minute of the day, None if this request not for today and shouldn't be marked
+        Returns:
+            list[str]
+        """
+        if now is None:
+            return [lesson + ' ' for lesson in lessons]
+
+        passed, upcoming = timeline.classify(now)
+        marks = ['🔴'] * passed + ['🟡'] * (upcoming - passed) + ['🟢'] * (len(lessons) - upcoming)
+        return [lesson + ' ' + mark for lesson, mark in zip(lessons, marks)]
+
+    @staticmethod
+    def render_day_schedule(group_number: str, parity: bool, weekday: str, language: str) -> tuple[str, list[tuple[str, int, int]]]:
+        """Renders day's schedule without time-dependent marks.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            weekday (str): day of the week
+            language (str): user's language
+        Returns:
+            tuple[str, list[tuple[str, int, int]]]: title and rendered lessons with their start and end minute
+        """
+        db = Database()
+        db.connect()
+
+        day_schedule = [(Schedule._pretty_lesson_str(lesson.slot, lesson.start_time, lesson.end_time, lesson.description),
+                         lesson.start, lesson.end)
+                        for lesson in db.get_lessons(group_number, parity, weekday)]
+
+        return f'<b>{MessageToUser.translate(weekday, language)}</b>', day_schedule
+
+    @staticmethod
+    def prerender(groups: list[str] | None = None) -> int:
+        """Renders schedules of groups for every parity, weekday and language and stores them in database.
+
+        Args:
+            groups (list[str] | None): groups to render, all groups if None
+        Returns:
+            int: number of stored schedules
+        """
+        db = Database()
+        db.connect()
+
+        rows = list()
+        for group_number, version in db.get_active_versions(groups).items():
+            for parity in (False, True):
+                days = [(weekday, Schedule.render_day_schedule(group_number, parity, weekday, MessageToUser.DEFAULT_LANGUAGE)[1])
+                        for weekday in Schedule.WEEKDAYS]
+                for language in MessageToUser.catalogs:
+                    week_schedule = ''
+                    for weekday, day_schedule in days:
+                        title = f'<b>{MessageToUser.translate(weekday, language)}</b>'
+                        lessons = [lesson for lesson, _, _ in day_schedule]
+                        times = json.dumps([[start, end] for _, start, end in day_schedule])
+                        rows.append((group_number, parity, weekday, language, version, '\n'.join([title] + lessons), times))
+                        week_schedule += title + '\n' + ''.join(lesson + '\n' for lesson in lessons)
+                    rows.append((group_number, parity, 'week', language, version, week_schedule, '[]'))
+
+        db.store_rendered(rows)
+        return len(rows)
+
+    @staticmethod
+    def load_day_schedule(group_number: str, parity: bool, weekday: str, language: str) -> tuple[str, list[tuple[str, int, int]]]:
+        """Loads day's schedule rendered at import, renders it if it isn't stored.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            weekday (str): day of the week
+            language (str): user's language
+        Returns:
+            tuple[str, list[tuple[str, int, int]]]: title and rendered lessons with their start and end minute
+        """
+        db = Database()
+        db.connect()
+
+        row = db.get_rendered(group_number, parity, weekday, MessageToUser.resolve_language(language))
+        if row is None:
+            return Schedule.render_day_schedule(group_number, parity, weekday, language)
+
+        title, *lessons = row[0].split('\n')
+        return title, [(lesson, start, end) for lesson, (start, end) in zip(lessons, json.loads(row[1]))]
+
+    @staticmethod
+    def get_day(group_number: str, parity: bool, weekday: str, language: str) -> tuple[str, list[str], Timeline]:
+        """Returns day's schedule from cache, loading it on the first request.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            weekday (str): day of the week
+            language (str): user's language
+        Returns:
+            tuple[str, list[str], Timeline]: title, rendered lessons and their timeline
+        """
+        language = MessageToUser.resolve_language(language)  # codes sharing catalog share cached text
+        key = (Schedule.generation, group_number, parity, weekday, language)
+        day = Schedule.rendered.get(key)
+        if day is None:
+            title, day_schedule = Schedule.load_day_schedule(group_number, parity, weekday, language)
+            day = (title, [lesson for lesson, _, _ in day_schedule], Timeline([(start, end) for _, start, end in day_schedule]))
+            Schedule.rendered.put(key, day)
+        return day
+
+    @staticmethod
+    def get_today_schedule(group_number: str, parity: bool, weekday: str, language: str, now: datetime | None = None) -> str:
+        """Returns today's schedule for user.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            weekday (str): day of the week
+            language (str): user's language
+            now (datetime | None): current time, lessons are marked only if weekday is its day
+        Returns:
+            str
+        """
+        if weekday == 'Воскресенье':
+            return 'Не волнуйтесь, это воскресенье 🥳'
+
+        title, lessons, timeline = Schedule.get_day(group_number, parity, weekday, language)
+        now = now or datetime.now()
+        today = Schedule.number_to_weekday(now.weekday()) == weekday  # False if this request not for today
+
+        return '\n'.join([title] + Schedule.mark_day_schedule(lessons, timeline, Schedule.minute_of_day(now) if today else None))
+
+    @staticmethod
+    def get_next_lesson(group_number: str, parity: bool, weekday: str, language: str, now: float) -> str:
+        """Returns user's next lesson today and time left before it.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            weekday (str): day of the week
+            language (str): user's language
+            now (float): minute of the day
+        Returns:
+            str
+        """
+        if weekday == 'Воскресенье':
+            return MessageToUser.translate('Не волнуйтесь, это воскресенье 🥳', language)
+
+        _, lessons, timeline = Schedule.get_day(group_number, parity, weekday, language)
+        upcoming = timeline.next_lesson(now)
+        if upcoming is None:
+            return MessageToUser.translate('Сегодня больше нет пар 🎉', language)
+
+        minutes = math.ceil(timeline.starts[upcoming] - now)
+        return MessageToUser.translate('Следующая пара через {minutes} мин.:\n', language).format(minutes=minutes) + lessons[upcoming]
+
+    @staticmethod
+    def get_week_schedule(group_number: str, parity: bool, language: str) -> str:
+        """Returns week's schedule for user.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            language (str): user's language
+        Returns:
+            str
+        """
+        language = MessageToUser.resolve_language(language)
+        key = (Schedule.generation, group_number, parity, 'week', language)
+        week_schedule = Schedule.rendered.get(key)
+        if week_schedule is None:
+            db = Database()
+            db.connect()
+            row = db.get_rendered(group_number, parity, 'week', MessageToUser.resolve_language(language))
+            week_schedule = row[0] if row else Schedule.render_week_schedule(group_number, parity, language)
+            Schedule.rendered.put(key, week_schedule)
+
+        return week_schedule
+
+    @staticmethod
+    def render_week_schedule(group_number: str, parity: bool, language: str) -> str:
+        """Renders week's schedule.
+
+        Args:
+            group_number (str): user's group
+            parity (bool): parity of the week
+            language (str): user's language
+        Returns:
+            str
+        """
+        week_schedule = ''
+        for weekday in Schedule.WEEKDAYS:
+            title, day_schedule = Schedule.render_day_schedule(group_number, parity, weekday, language)
+            week_schedule += title + '\n' + ''.join(lesson + '\n' for lesson, _, _ in day_schedule)
+        return week_schedule
+
+    @staticmethod
+    def _pretty_lesson_str(i: int, start_time: str, end_time: str, description: str):
+        """Used for string formatting."""
+        if description:
+            description = " ".join(description.replace('\n', ' ').split())
+            return f"{i}) ({start_time}-{end_time}) {description}"
+        return ""
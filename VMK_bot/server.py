@@ -1,25 +1,74 @@
 """Server side for Schedule Telegram bot."""
 
-import asyncio
+import time
 from VMK_bot.messageUI import MessageToUser
 from VMK_bot.keyboards import Keyboards
-from VMK_bot.database import Database
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.groups import GroupRegistry
+from VMK_bot.users import UserStore
+from VMK_bot.fsm_storage import SQLiteStorage
+from VMK_bot.metrics import Metrics
+from VMK_bot.webhook import start_webhook
+from VMK_bot.throttling import TokenBucketLimiter
+from VMK_bot.broadcast import Broadcaster
+from VMK_bot.outbound import Outbox
+from VMK_bot.reload import ScheduleReloader
+from VMK_bot import config
 from aiogram import Bot, Dispatcher, executor, types
-from VMK_bot.config import TOKEN
-from aiogram.contrib.fsm_storage.memory import MemoryStorage
 from aiogram.dispatcher import FSMContext
 from aiogram.dispatcher.filters.state import StatesGroup, State
 from aiogram.dispatcher.middlewares import BaseMiddleware
-from aiogram.utils.exceptions import Throttled
-from aiogram.dispatcher.handler import CancelHandler
+from aiogram.dispatcher.handler import CancelHandler, current_handler
 import datetime
-from VMK_bot.pdf_parser import Parser
+from VMK_bot.schedule import Schedule
 
 
-bot = Bot(TOKEN)
-storage = MemoryStorage()
-dp = Dispatcher(bot, storage=storage)
+class MeteredBot(Bot):
+    """Bot that records latency of every Telegram Bot API request."""
+
+    async def request(self, method: str, data: dict | None = None, files: dict | None = None, **kwargs):
+        """Makes request to Telegram Bot API.
+
+        Args:
+            method (str): API method
+            data (dict | None): request parameters
+            files (dict | None): files to upload
+            kwargs: other arguments of Bot.request
+        Returns:
+            result of API method
+        """
+        start = time.perf_counter()
+        try:
+            return await super().request(method, data, files, **kwargs)
+        finally:
+            Metrics().api_seconds.observe(time.perf_counter() - start, method)
+
+
+bot = MeteredBot(config.TOKEN)
 db = Database()
+adb = AsyncDatabase()
+storage = SQLiteStorage(adb)
+dp = Dispatcher(bot, storage=storage)
+users = UserStore(adb)
+groups = GroupRegistry()
+outbox = Outbox(bot, workers=getattr(config, 'OUTBOX_WORKERS', 8), rate=getattr(config, 'OUTBOX_RATE', 25.0),
+                chat_interval=getattr(config, 'OUTBOX_CHAT_INTERVAL', 1.0))
+broadcaster = Broadcaster(outbox, adb, at=getattr(config, 'BROADCAST_TIME', '20:00'))
+metrics = Metrics()
+
+
+async def on_schedule_reload() -> None:
+    """Drops in-memory data of the previous schedule after pdf tables are reloaded."""
+    await groups.refresh_async(adb)
+    Schedule.invalidate()
+
+
+reloader = ScheduleReloader(getattr(config, 'SCHEDULE_TABLES', 'schedule_tables'), on_reload=on_schedule_reload,
+                            interval=getattr(config, 'RELOAD_INTERVAL', 5.0))
+metrics.track_cache('rendered', Schedule.rendered)
+metrics.track_cache('users', users.cache)
+metrics.track_cache('fsm', storage.cache)
+metrics.outbox_depth.track(lambda: len(outbox))
 
 
 class StudentGroupState(StatesGroup):
@@ -44,65 +93,99 @@ class StudentGroupState(StatesGroup):
 class StateMiddleware(BaseMiddleware):
     """State's Middleware (stage between request is sent to bot and its actual processing by handler).
 
-    Puts user's FSM in the state where user left it
-    This concept makes bot independent of shutdowns on its side
+    States are kept in persistent FSM storage. Earlier versions stored them in students table,
+    so user without state in storage gets the state stored there ('processing' for a new user)
     """
 
     @staticmethod
     async def on_pre_process_message(message: types.Message, data: dict) -> None:
-        """Method to set user's FSM in the last state.
+        """Method to move user's state from students table into FSM storage.
 
         Args:
             message (types.Message): message from user
             data (dict): namespace
         """
-        username = message.from_user.username
-        user_state = db.get_user_state(username)
-        cur_state = StudentGroupState.STATES[user_state]
-        await cur_state.set()
+        state = dp.current_state(chat=message.chat.id, user=message.from_user.id)
+        if await state.get_state() is None:
+            user_state = await users.get_state(message.from_user.username)
+            await state.set_state(StudentGroupState.STATES[user_state])
 
 
-class ThrottlingMiddleware(BaseMiddleware):
-    """Antiflood Middleware."""
+class MetricsMiddleware(BaseMiddleware):
+    """Metrics Middleware.
 
-    def __init__(self, rate_limit: int = 0.5):
-        """Initializes the object's attributes.
+    Measures time from receiving message to the end of its processing by handler,
+    so it should be set up before other middlewares. Messages rejected by antiflood are recorded as 'throttled'
+    """
+
+    @staticmethod
+    async def on_pre_process_message(message: types.Message, data: dict) -> None:
+        """Method to remember when processing of message started.
 
         Args:
-            rate_limit (int): limit (in seconds) for messages/second
+            message (types.Message): message from user
+            data (dict): namespace
         """
-        BaseMiddleware.__init__(self)
-        self.rate_limit = rate_limit
+        data['metrics_start'] = time.perf_counter()
 
-    async def on_process_message(self, message: types.Message, data: dict) -> None:
-        """Method to interrupt processing new message if limit exceeded.
+    @staticmethod
+    async def on_process_message(message: types.Message, data: dict) -> None:
+        """Method to remember handler chosen for message.
 
         Args:
             message (types.Message): message from user
             data (dict): namespace
         """
-        dp = Dispatcher.get_current()
-
-        try:
-            await dp.throttle(key='antiflood_message', rate=self.rate_limit)
-        except Throttled as _t:
-            await self.msg_throttle(message, _t)
-            raise CancelHandler()
+        data['metrics_handler'] = current_handler.get().__name__
 
     @staticmethod
-    async def msg_throttle(message: types.Message, throttled: Throttled) -> None:
-        """Method to send a message to user that he's exceeded limit for messages.
+    async def on_post_process_message(message: types.Message, results: list, data: dict) -> None:
+        """Method to record latency of processed message.
 
         Args:
             message (types.Message): message from user
-            throttled (Throttled): an exception caused by limit's exceeding
+            results (list): results of handlers
+            data (dict): namespace
         """
-        delta = throttled.rate - throttled.delta
-        if throttled.exceeded_count <= 2:
+        handler = 'throttled' if data.get('throttled') else data.get('metrics_handler', 'unhandled')
+        metrics.requests.inc(handler)
+        metrics.handler_seconds.observe(time.perf_counter() - data['metrics_start'], handler)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Antiflood Middleware.
+
+    Messages over the limit are rejected at once, user is warned at most once per warn window
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 5, warn_window: float = 10.0):
+        """Initializes the object's attributes.
+
+        Args:
+            rate (float): messages per second allowed for every user
+            burst (int): number of messages user can send at once
+            warn_window (float): minimal time in seconds between warnings to one user
+        """
+        BaseMiddleware.__init__(self)
+        self.limiter = TokenBucketLimiter(rate, burst, warn_window)
+
+    async def on_process_message(self, message: types.Message, data: dict) -> None:
+        """Method to interrupt processing new message if limit exceeded.
+
+        Args:
+            message (types.Message): message from user
+            data (dict): namespace
+        """
+        if self.limiter.consume(message.from_user.id):
+            return
+
+        metrics.throttled.inc()
+        data['throttled'] = True
+        if self.limiter.should_warn(message.from_user.id):
             message_to_user = MessageToUser.translate('Вы превысили лимит сообщений. Подождите',
                                                       message.from_user.language_code)
-            await message.reply(message_to_user)
-        await asyncio.sleep(delta)
+            outbox.send(message.chat.id, message_to_user, reply_to_message_id=message.message_id)
+        raise CancelHandler()
 
 
 async def on_startup(_) -> None:
@@ -111,22 +194,46 @@ async def on_startup(_) -> None:
     Should connect to the users database
     """
     db.connect()
+    groups.refresh()
+    await adb.start()
+    users.start()
+    storage.start()
+    outbox.start()
+    broadcaster.start()
+    if getattr(config, 'SCHEDULE_TABLES', 'schedule_tables'):
+        reloader.start()
+    if getattr(config, 'METRICS_PORT', 9090):
+        await metrics.serve(getattr(config, 'METRICS_HOST', '127.0.0.1'), getattr(config, 'METRICS_PORT', 9090))
     print('Bot has been started')
 
 
-async def set_state(state: FSMContext, new_state: str, message: types.Message) -> None:
+async def on_shutdown(dispatcher: Dispatcher) -> None:
+    """Executes on bot's shutdown.
+
+    Sends queued replies, flushes pending user updates and waits for database queries.
+    aiogram stops polling only after this callback, so polling is stopped here first
+    and no update reaches storage or users after database is closed
+    """
+    if dispatcher.is_polling():
+        dispatcher.stop_polling()
+        await dispatcher.wait_closed()
+    await metrics.stop()
+    await reloader.stop()
+    await broadcaster.stop()
+    await outbox.stop()
+    await storage.close()
+    await users.stop()
+    await adb.close()
+
+
+async def set_state(state: FSMContext, new_state: str) -> None:
     """Sets FSM in a specific state.
 
     Args:
-        state (FSMContext): significant to open proxy and write state into it
+        state (FSMContext): FSM of user
         new_state (str): string repr of state to be set
-        message (types.Message): message of user
     """
-    async with state.proxy() as data:
-        data['state'] = new_state
-
-    await db.edit_user_state(state, message.from_user.username)
-    await StudentGroupState.STATES[new_state].set()
+    await state.set_state(StudentGroupState.STATES[new_state])
 
 
 @dp.message_handler(commands=['start'], state='*')
@@ -141,18 +248,18 @@ async def cmd_start(message: types.Message, state: FSMContext) -> None:
     """
     message_to_user = MessageToUser.translate('Добро пожаловать!\nЯ бот, отправляющий расписание ВМК',
                                               message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=message_to_user,
-                           reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user,
+                reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
 
     message_to_user = MessageToUser.translate('Для получения расписания введите номер вашей учебной группы',
                                               message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=message_to_user,
-                           reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user,
+                reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
 
-    db.add_user(message.from_user.username)
-    await set_state(state, 'processing', message)
+    users.add_user(message.from_user.username)
+    await set_state(state, 'processing')
 
 
 @dp.message_handler(commands=['help'], state='*')
@@ -164,10 +271,11 @@ async def cmd_help(message: types.Message) -> None:
     Args:
         message (types.Message): message from user
     """
-    message_to_user = MessageToUser.translate('/start - начать работу с ботом\n/help - получить подсказки по командам',
+    message_to_user = MessageToUser.translate(('/start - начать работу с ботом\n/help - получить подсказки по командам\n'
+                                               '/subscribe - получать расписание на завтра каждый вечер\n/unsubscribe - отменить подписку'),
                                               message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=message_to_user)
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user)
 
 
 @dp.message_handler(lambda message: message.text == MessageToUser.translate('Расписание на сегодня  ▶️', message.from_user.language_code),
@@ -183,8 +291,9 @@ async def cmd_today_schedule(message: types.Message, state: FSMContext) -> None:
     """
     week = datetime.datetime.today().isocalendar()[1]
     day = datetime.datetime.today().weekday()
-    group_number = db.get_user_group(message.from_user.username)
-    schedule = Parser.get_today_schedule(group_number, week % 2, Parser.number_to_weekday(day), message.from_user.language_code)
+    group_number = await users.get_group(message.from_user.username)
+    schedule = await adb.read(Schedule.get_today_schedule, group_number, week % 2, Schedule.number_to_weekday(day),
+                              message.from_user.language_code)
 
     if day != 6:
         message_to_user = MessageToUser.translate('Держите ваше расписание на сегодня\n',
@@ -193,9 +302,9 @@ async def cmd_today_schedule(message: types.Message, state: FSMContext) -> None:
         message_to_user = ""
 
     schedule = message_to_user + MessageToUser.translate(schedule, message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=schedule, parse_mode='HTML',
-                           reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.from_user.id,
+                text=schedule, parse_mode='HTML',
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
 
 
 @dp.message_handler(lambda message: message.text == MessageToUser.translate('Расписание на неделю  ⏭', message.from_user.language_code),
@@ -210,16 +319,16 @@ async def cmd_week_schedule(message: types.Message, state: FSMContext) -> None:
         state (FSMContext): state of user
     """
     week = datetime.datetime.today().isocalendar()[1]
-    group_number = db.get_user_group(message.from_user.username)
-    schedule = Parser.get_week_schedule(group_number, week % 2, message.from_user.language_code)
+    group_number = await users.get_group(message.from_user.username)
+    schedule = await adb.read(Schedule.get_week_schedule, group_number, week % 2, message.from_user.language_code)
 
     message_to_user = MessageToUser.translate('Держите ваше расписание на неделю\n',
                                               message.from_user.language_code)
 
     schedule = message_to_user + MessageToUser.translate(schedule, message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=schedule, parse_mode='HTML',
-                           reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.from_user.id,
+                text=schedule, parse_mode='HTML',
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
 
 
 @dp.message_handler(lambda message: message.text == MessageToUser.translate('Расписание на завтра  ⏩', message.from_user.language_code),
@@ -236,8 +345,9 @@ async def cmd_tomorrow_schedule(message: types.Message, state: FSMContext) -> No
     tomorrow = datetime.datetime.now() + datetime.timedelta(days=1)
     week = tomorrow.isocalendar()[1]
     day = tomorrow.weekday()
-    group_number = db.get_user_group(message.from_user.username)
-    schedule = Parser.get_today_schedule(group_number, week % 2, Parser.number_to_weekday(day), message.from_user.language_code)
+    group_number = await users.get_group(message.from_user.username)
+    schedule = await adb.read(Schedule.get_today_schedule, group_number, week % 2, Schedule.number_to_weekday(day),
+                              message.from_user.language_code)
 
     if day != 6:
         message_to_user = MessageToUser.translate('Держите ваше расписание на завтра\n',
@@ -246,9 +356,69 @@ async def cmd_tomorrow_schedule(message: types.Message, state: FSMContext) -> No
         message_to_user = ""
 
     schedule = message_to_user + MessageToUser.translate(schedule, message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=schedule, parse_mode='HTML',
-                           reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.from_user.id,
+                text=schedule, parse_mode='HTML',
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+
+
+@dp.message_handler(lambda message: message.text == MessageToUser.translate('Следующая пара  ⏱', message.from_user.language_code),
+                    state=StudentGroupState.final)
+async def cmd_next_lesson(message: types.Message, state: FSMContext) -> None:
+    """Handler of command next_lesson from user in final state.
+
+    Sends user's next lesson today and time left before it
+
+    Args:
+        message (types.Message): message from user
+        state (FSMContext): state of user
+    """
+    now = datetime.datetime.now()
+    week = now.isocalendar()[1]
+    group_number = await users.get_group(message.from_user.username)
+    schedule = await adb.read(Schedule.get_next_lesson, group_number, week % 2, Schedule.number_to_weekday(now.weekday()),
+                              message.from_user.language_code, Schedule.minute_of_day(now))
+
+    outbox.send(chat_id=message.from_user.id,
+                text=schedule, parse_mode='HTML',
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+
+
+@dp.message_handler(commands=['subscribe'], state=StudentGroupState.final)
+async def cmd_subscribe(message: types.Message, state: FSMContext) -> None:
+    """Handler of command 'subscribe' from user in final state.
+
+    Subscribes user to daily broadcast of tomorrow's schedule
+
+    Args:
+        message (types.Message): message from user
+        state (FSMContext): state of user
+    """
+    users.set_subscription(message.from_user.username, message.chat.id, message.from_user.language_code, True)
+
+    message_to_user = MessageToUser.translate('Вы подписались на расписание на завтра, оно будет приходить каждый день в {time}',
+                                              message.from_user.language_code)
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user.format(time=getattr(config, 'BROADCAST_TIME', '20:00')),
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+
+
+@dp.message_handler(commands=['unsubscribe'], state=StudentGroupState.final)
+async def cmd_unsubscribe(message: types.Message, state: FSMContext) -> None:
+    """Handler of command 'unsubscribe' from user in final state.
+
+    Cancels user's subscription to daily broadcast of tomorrow's schedule
+
+    Args:
+        message (types.Message): message from user
+        state (FSMContext): state of user
+    """
+    users.set_subscription(message.from_user.username, message.chat.id, message.from_user.language_code, False)
+
+    message_to_user = MessageToUser.translate('Вы отписались от расписания на завтра',
+                                              message.from_user.language_code)
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user,
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
 
 
 @dp.message_handler(lambda message: message.text == MessageToUser.translate('Вернуться назад  ↩️', message.from_user.language_code),
@@ -264,44 +434,41 @@ async def cmd_cancel(message: types.Message, state: FSMContext) -> None:
     """
     message_to_user = MessageToUser.translate('Вы вернулись в главное меню',
                                               message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=message_to_user,
-                           reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user,
+                reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
 
     message_to_user = MessageToUser.translate('Для получения расписания введите номер вашей учебной группы',
                                               message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=message_to_user,
-                           reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
-    await set_state(state, 'processing', message)
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user,
+                reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
+    await set_state(state, 'processing')
 
 
-@dp.message_handler(lambda message: message.text in db.get_valid_groups(),
+@dp.message_handler(lambda message: message.text in groups,
                     state=StudentGroupState.processing)
 async def handle_number(message: types.Message, state: FSMContext) -> None:
     """Handler of group number from user in initial state.
 
-    Stores number in state.proxy, edits database with new group for user,
+    Edits database with new group for user,
     sets FSM to final state and sends Option Keyboard to user
 
     Args:
         message (types.Message): message from user
         state (FSMContext): state of user
     """
-    async with state.proxy() as data:
-        data['group'] = message.text
-
-    await db.edit_user_group(state, username=message.from_user.username)
+    users.set_group(message.from_user.username, groups.resolve(message.text))
 
     message_to_user = MessageToUser.translate('Выберите опцию!',
                                               message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=message_to_user,
-                           reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
-    await set_state(state, 'final', message)
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user,
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+    await set_state(state, 'final')
 
 
-@dp.message_handler(lambda message: message.text not in db.get_valid_groups(),
+@dp.message_handler(lambda message: message.text not in groups,
                     state=StudentGroupState.processing)
 async def handle_wrong_number(message: types.Message, state: FSMContext) -> None:
     """Handler of wrong group number from user in initial state.
@@ -314,8 +481,9 @@ async def handle_wrong_number(message: types.Message, state: FSMContext) -> None
     """
     message_to_user = MessageToUser.translate('Неверный номер группы!\nПовторите попытку',
                                               message.from_user.language_code)
-    await message.reply(text=message_to_user,
-                        reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.chat.id,
+                text=message_to_user, reply_to_message_id=message.message_id,
+                reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
 
 
 @dp.message_handler(state=StudentGroupState.final)
@@ -330,9 +498,9 @@ async def handle_message_while_final(message: types.Message, state: FSMContext)
     """
     message_to_user = MessageToUser.translate('Выберите опцию!',
                                               message.from_user.language_code)
-    await bot.send_message(chat_id=message.from_user.id,
-                           text=message_to_user,
-                           reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.from_user.id,
+                text=message_to_user,
+                reply_markup=Keyboards.get_cancel_kb(message.from_user.language_code))
 
 
 @dp.message_handler(state=StudentGroupState.processing)
@@ -347,15 +515,45 @@ async def handle_message_while_processing(message: types.Message, state: FSMCont
     """
     message_to_user = MessageToUser.translate('Выберите опцию!',
                                               message.from_user.language_code)
-    await message.reply(text=message_to_user,
-                        reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
+    outbox.send(chat_id=message.chat.id,
+                text=message_to_user, reply_to_message_id=message.message_id,
+                reply_markup=Keyboards.get_start_kb(message.from_user.language_code))
 
 
-def run_server():
-    """Runs server logic."""
+def setup_dispatcher(throttling: bool = True) -> Dispatcher:
+    """Sets up middlewares of dispatcher.
+
+    Args:
+        throttling (bool): whether to limit rate of messages from every user
+    Returns:
+        Dispatcher
+    """
+    dp.middleware.setup(MetricsMiddleware())
     dp.middleware.setup(StateMiddleware())
-    dp.middleware.setup(ThrottlingMiddleware())
+    if throttling:
+        dp.middleware.setup(ThrottlingMiddleware(rate=getattr(config, 'THROTTLE_RATE', 2.0),
+                                                 burst=getattr(config, 'THROTTLE_BURST', 5)))
+    return dp
 
-    executor.start_polling(dispatcher=dp,
-                           skip_updates=True,
-                           on_startup=on_startup)
+
+def run_server():
+    """Runs server logic.
+
+    Bot receives updates via webhook if WEBHOOK_URL is set in config and via long polling otherwise
+    """
+    setup_dispatcher()
+
+    if getattr(config, 'WEBHOOK_URL', None):
+        start_webhook(dispatcher=dp,
+                      url=config.WEBHOOK_URL,
+                      host=getattr(config, 'WEBHOOK_HOST', '127.0.0.1'),
+                      port=getattr(config, 'WEBHOOK_PORT', 8080),
+                      path=getattr(config, 'WEBHOOK_PATH', None),
+                      secret=getattr(config, 'WEBHOOK_SECRET', None),
+                      on_startup=on_startup,
+                      on_shutdown=on_shutdown)
+    else:
+        executor.start_polling(dispatcher=dp,
+                               skip_updates=True,
+                               on_startup=on_startup,
+                               on_shutdown=on_shutdown)
@@ -0,0 +1,81 @@
+"""Rate limiting of users for Schedule Telegram bot."""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class TokenBucketLimiter:
+    """Token bucket per user, every message takes a token and tokens are refilled with constant rate.
+
+    Buckets are kept in order of last use. Bucket unused for the time of its full refill is equal to
+    a new one, so such buckets are evicted from the front, which keeps memory bounded by active users.
+
+    Args:
+        rate (float): tokens refilled per second
+        burst (int): capacity of bucket, number of messages that can be sent at once
+        warn_window (float): minimal time in seconds between warnings to one user
+        idle (float): time in seconds after which unused bucket is evicted
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 5, warn_window: float = 10.0) -> None:
+        """Init method."""
+        self.rate = rate
+        self.burst = burst
+        self.warn_window = warn_window
+        self.idle = max(burst / rate, warn_window)
+        self._buckets = OrderedDict()  # key -> [tokens, last update, last warning]
+
+    def _evict(self, now: float) -> None:
+        """Drops buckets unused for idle time."""
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if now - bucket[1] < self.idle:
+                break
+            del self._buckets[key]
+
+    def consume(self, key: Hashable, now: float | None = None) -> bool:
+        """Takes token from user's bucket.
+
+        Args:
+            key (Hashable): user id
+            now (float | None): current monotonic time
+        Returns:
+            bool: False if bucket is empty and message should be rejected
+        """
+        now = time.monotonic() if now is None else now
+        self._evict(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now, -math.inf]
+        else:
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def should_warn(self, key: Hashable, now: float | None = None) -> bool:
+        """Checks if rejected user should be warned, which happens at most once per warn window.
+
+        Args:
+            key (Hashable): user id
+            now (float | None): current monotonic time
+        Returns:
+            bool
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None or now - bucket[2] < self.warn_window:
+            return False
+        bucket[2] = now
+        return True
+
+    def __len__(self) -> int:
+        """Len method."""
+        return len(self._buckets)
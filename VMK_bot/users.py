@@ -0,0 +1,136 @@
+"""Cached user profiles for Schedule Telegram bot."""
+
+from VMK_bot.cache import LRUCache
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.write_behind import WriteBehindBuffer
+
+
+class UserProfile:
+    """User's state and group.
+
+    Args:
+        state (str): string repr of user's state
+        group_number (str): user's group, 'none' for unknown user
+    """
+
+    __slots__ = ('state', 'group_number')
+
+    def __init__(self, state: str, group_number: str) -> None:
+        """Init method."""
+        self.state = state
+        self.group_number = group_number
+
+
+class UserStore:
+    """User profiles cached in memory and written into database with write-behind buffer.
+
+    Profiles are loaded on first access and updated write-through, so requests of
+    a returning user are served without touching database.
+
+    Args:
+        adb (AsyncDatabase): database with students table
+        maxsize (int): maximum number of cached profiles
+        cache (LRUCache): cached profiles by username
+        buffer (WriteBehindBuffer): updates which are not written into database yet
+    """
+
+    def __init__(self, adb: AsyncDatabase, maxsize: int = 100000) -> None:
+        """Init method."""
+        self.adb = adb
+        self.cache = LRUCache(maxsize=maxsize)
+        self.buffer = WriteBehindBuffer(adb)
+
+    async def get_profile(self, username: str) -> UserProfile:
+        """Returns user's profile.
+
+        Args:
+            username (str): username
+        Returns:
+            UserProfile
+        """
+        profile = self.cache.get(username)
+        if profile is not None:
+            return profile
+
+        flushes = self.buffer.flushes
+        before = self.buffer.pending(username)
+        row = await self.adb.read(Database().get_user, username)
+        after = self.buffer.pending(username)
+
+        profile = self.cache.peek(username)  # could be loaded by another request meanwhile
+        if profile is not None:
+            return profile
+
+        profile = UserProfile(*row) if row else UserProfile('processing', 'none')
+        if before is not None or after is not None:  # updates made before or during the read
+            fields = (before or {}) | (after or {})
+            if row is None:
+                profile.group_number = ''
+            profile.state = fields.get('state', profile.state)
+            profile.group_number = fields.get('group_number', profile.group_number)
+
+        if flushes % 2 == 0 and flushes == self.buffer.flushes:  # updates written during the read aren't pending anymore
+            self.cache.put(username, profile)
+        return profile
+
+    async def get_state(self, username: str) -> str:
+        """Returns user's state stored in students table by earlier versions, see StateMiddleware.
+
+        Args:
+            username (str): username
+        Returns:
+            str
+        """
+        return (await self.get_profile(username)).state
+
+    async def get_group(self, username: str) -> str:
+        """Returns user's group.
+
+        Args:
+            username (str): username
+        Returns:
+            str
+        """
+        return (await self.get_profile(username)).group_number
+
+    def add_user(self, username: str) -> None:
+        """Adds a new user.
+
+        Args:
+            username (str): username
+        """
+        profile = self.cache.peek(username)
+        if profile is not None and profile.group_number == 'none':
+            profile.group_number = ''
+        self.buffer.add_user(username)
+
+    def set_group(self, username: str, group_number: str) -> None:
+        """Edits user's group.
+
+        Args:
+            username (str): username
+            group_number (str): user's group
+        """
+        profile = self.cache.peek(username)
+        if profile is not None:
+            profile.group_number = group_number
+        self.buffer.edit_user_group(username, group_number)
+
+    def set_subscription(self, username: str, chat_id: int, language: str | None, subscribed: bool) -> None:
+        """Subscribes user to broadcast of tomorrow's schedule or cancels subscription.
+
+        Args:
+            username (str): username
+            chat_id (int): chat to send schedule to
+            language (str | None): user's language
+            subscribed (bool): is user subscribed
+        """
+        self.buffer.edit_user_subscription(username, chat_id, language, subscribed)
+
+    def start(self) -> None:
+        """Starts periodic flushing of updates."""
+        self.buffer.start()
+
+    async def stop(self) -> None:
+        """Stops periodic flushing and flushes the rest of updates."""
+        await self.buffer.stop()
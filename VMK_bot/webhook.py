@@ -0,0 +1,95 @@
+"""Webhook mode of Schedule Telegram bot."""
+
+import hmac
+import secrets
+from typing import Callable
+from urllib.parse import urlsplit
+from aiohttp import web
+from aiogram import Bot, Dispatcher, types
+from aiogram.dispatcher.webhook import BOT_DISPATCHER_KEY, WebhookRequestHandler
+from aiogram.utils.executor import Executor
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+SECRET_KEY = 'WEBHOOK_SECRET'
+
+
+class SecretWebhookRequestHandler(WebhookRequestHandler):
+    """Webhook request handler, which accepts only updates sent with the secret token given to setWebhook.
+
+    Every request is processed in its own task of aiohttp server, so updates are handled concurrently
+    """
+
+    async def post(self) -> web.Response:
+        """Method to process update sent by Telegram.
+
+        Returns:
+            web.Response
+        """
+        self.validate_secret()
+        return await super().post()
+
+    async def parse_update(self, bot: Bot) -> types.Update:
+        """Method to read update from request, malformed update is a bad request.
+
+        Args:
+            bot (Bot): bot of dispatcher
+        Returns:
+            types.Update
+        """
+        try:
+            return await super().parse_update(bot)
+        except (ValueError, TypeError):
+            raise web.HTTPBadRequest()
+
+    def validate_secret(self) -> None:
+        """Method to reject request without secret token."""
+        secret = self.request.app.get(SECRET_KEY)
+        if secret is not None and not hmac.compare_digest(self.request.headers.get(SECRET_HEADER, '').encode(), secret.encode()):
+            raise web.HTTPUnauthorized()
+
+
+def create_app(dispatcher: Dispatcher, path: str, secret: str | None = None) -> web.Application:
+    """Creates aiohttp application that passes updates posted to path to dispatcher.
+
+    Args:
+        dispatcher (Dispatcher): dispatcher of bot
+        path (str): path of webhook endpoint
+        secret (str | None): secret token expected in X-Telegram-Bot-Api-Secret-Token header, None to accept any request
+    Returns:
+        web.Application
+    """
+    app = web.Application()
+    app.router.add_route('*', path, SecretWebhookRequestHandler, name='webhook_handler')
+    app[BOT_DISPATCHER_KEY] = dispatcher
+    app[SECRET_KEY] = secret
+    return app
+
+
+def start_webhook(dispatcher: Dispatcher, url: str, host: str = '127.0.0.1', port: int = 8080, path: str | None = None,
+                  secret: str | None = None, max_connections: int = 40,
+                  on_startup: Callable | None = None, on_shutdown: Callable | None = None) -> None:
+    """Registers webhook in Telegram and serves it until shutdown.
+
+    Args:
+        dispatcher (Dispatcher): dispatcher of bot
+        url (str): public HTTPS url of webhook
+        host (str): address to listen on
+        port (int): port to listen on
+        path (str | None): path of webhook endpoint, path of url by default
+        secret (str | None): secret token of webhook, random by default
+        max_connections (int): maximum number of simultaneous connections from Telegram
+        on_startup (Callable | None): executes on startup with dispatcher as argument
+        on_shutdown (Callable | None): executes on shutdown with dispatcher as argument
+    """
+    path = path or urlsplit(url).path or '/'
+    secret = secret or secrets.token_urlsafe(32)
+
+    async def set_webhook(dp: Dispatcher) -> None:
+        await dp.bot.set_webhook(url, secret_token=secret, max_connections=max_connections, drop_pending_updates=True)
+
+    executor = Executor(dispatcher)
+    executor.on_startup([callback for callback in (on_startup, set_webhook) if callback is not None], polling=False)
+    if on_shutdown is not None:
+        executor.on_shutdown(on_shutdown, polling=False)
+    executor.set_webhook(web_app=create_app(dispatcher, path, secret))
+    executor.run_app(host=host, port=port)
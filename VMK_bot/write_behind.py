@@ -0,0 +1,134 @@
+"""Write-behind buffer of user updates for Schedule Telegram bot."""
+
+import asyncio
+import logging
+from typing import Callable, Hashable
+from VMK_bot.database import Database, AsyncDatabase
+
+log = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Coalesces updates of database records, students by default, and writes them in batches.
+
+    Updates of the same record are merged (last write wins) and flushed in one transaction
+    every interval seconds or as soon as max_records records are pending.
+
+    Args:
+        adb (AsyncDatabase): database to flush updates into
+        interval (float): maximum delay of update in seconds
+        max_records (int): number of pending records which triggers flush
+        writer (Callable[[dict], None]): database method applying updates by key, Database.update_users by default
+        flushes (int): incremented when flush starts and when it ends, so it's odd while updates are being written
+    """
+
+    def __init__(self, adb: AsyncDatabase, interval: float = 0.5, max_records: int = 500,
+                 writer: Callable[[dict], None] | None = None) -> None:
+        """Init method."""
+        self.adb = adb
+        self.interval = interval
+        self.max_records = max_records
+        self.writer = writer or Database().update_users
+        self.flushes = 0
+        self._pending = {}
+        self._full = asyncio.Event()
+        self._task = None
+
+    def update(self, key: Hashable, **fields: str | None) -> None:
+        """Stores pending update of the record.
+
+        Args:
+            key (Hashable): key of record, e.g. username
+            fields (str | None): new values of columns
+        """
+        self._pending.setdefault(key, {}).update(fields)
+        if len(self._pending) >= self.max_records:
+            self._full.set()
+
+    def add_user(self, username: str) -> None:
+        """Adds a new user.
+
+        Args:
+            username (str): username
+        """
+        self.update(username)
+
+    def edit_user_group(self, username: str, group_number: str) -> None:
+        """Edits user's group.
+
+        Args:
+            username (str): username
+            group_number (str): user's group
+        """
+        self.update(username, group_number=group_number)
+
+    def edit_user_subscription(self, username: str, chat_id: int, language: str | None, subscribed: bool) -> None:
+        """Edits user's subscription to broadcast of tomorrow's schedule.
+
+        Args:
+            username (str): username
+            chat_id (int): chat to send schedule to
+            language (str | None): user's language
+            subscribed (bool): is user subscribed
+        """
+        self.update(username, chat_id=chat_id, language=language, subscribed=int(subscribed))
+
+    def pending(self, key: Hashable) -> dict[str, str | None] | None:
+        """Returns copy of record's updates which are not written into database yet.
+
+        Args:
+            key (Hashable): key of record, e.g. username
+        Returns:
+            dict[str, str | None] | None: None if there are no pending updates
+        """
+        fields = self._pending.get(key)
+        return None if fields is None else dict(fields)
+
+    def __len__(self) -> int:
+        """Len method."""
+        return len(self._pending)
+
+    async def flush(self) -> None:
+        """Writes all pending updates in one transaction."""
+        pending, self._pending = self._pending, {}
+        self._full.clear()
+        if not pending:
+            return
+
+        self.flushes += 1
+        try:
+            await self.adb.write(self.writer, pending)
+        except Exception:
+            for key, fields in pending.items():  # newer updates win over returned ones
+                self._pending[key] = fields | self._pending.get(key, {})
+            raise
+        finally:
+            self.flushes += 1
+
+    async def _run(self) -> None:
+        """Flushes updates periodically."""
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                log.exception('Failed to flush %d pending records', len(self))
+
+    def start(self) -> None:
+        """Starts periodic flushing."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops periodic flushing and flushes the rest of updates."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
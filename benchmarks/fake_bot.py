@@ -0,0 +1,57 @@
+"""Offline stand-ins for Telegram used by benchmarks and tests."""
+
+from aiogram import Bot
+
+
+class FakeBot(Bot):
+    """Bot that records Bot API requests instead of sending them to Telegram.
+
+    Args:
+        requests (list[tuple[str, dict]]): API methods and parameters of requests
+    """
+
+    def __init__(self) -> None:
+        """Init method."""
+        super().__init__('123456789:' + 'A' * 35)
+        self.requests = []
+
+    async def request(self, method: str, data: dict | None = None, files: dict | None = None, **kwargs):
+        """Records request and answers like Telegram would.
+
+        Args:
+            method (str): API method
+            data (dict | None): request parameters
+            files (dict | None): files to upload
+            kwargs: other arguments of Bot.request
+        Returns:
+            sent message for sendMessage, True for other methods
+        """
+        self.requests.append((method, data))
+        if method == 'sendMessage':
+            return {'message_id': len(self.requests), 'date': 0, 'text': data.get('text'),
+                    'chat': {'id': int(data['chat_id']), 'type': 'private'}}
+        return True
+
+    def sent_texts(self) -> list[str]:
+        """Returns texts of sent messages in order they were sent."""
+        return [data['text'] for method, data in self.requests if method == 'sendMessage']
+
+
+def make_update(update_id: int, text: str, user_id: int = 1, language: str = 'ru') -> dict:
+    """Makes update with private text message from user.
+
+    Args:
+        update_id (int): id of update and message
+        text (str): text of message, commands get bot_command entity
+        user_id (int): id of user and chat
+        language (str): language of user
+    Returns:
+        dict: update as Telegram sends it
+    """
+    message = {'message_id': update_id, 'date': 0, 'text': text,
+               'chat': {'id': user_id, 'type': 'private'},
+               'from': {'id': user_id, 'is_bot': False, 'first_name': 'Student', 'username': f'user{user_id}',
+                        'language_code': language}}
+    if text.startswith('/'):
+        message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+    return {'update_id': update_id, 'message': message}
@@ -0,0 +1,81 @@
+"""Import time of the bot's serving path, measured with python -X importtime.
+
+Serving replies needs only database reads and string formatting, so importing VMK_bot.server
+must not load PDF ingestion dependencies, which take most of the startup time.
+"""
+
+import argparse
+import subprocess
+import sys
+
+HEAVY = ('camelot', 'cv2', 'ghostscript', 'numpy', 'pandas', 'pdfminer', 'pypdf')
+CODE = '''
+import sys, types
+try:
+    import VMK_bot.config
+except ImportError:
+    sys.modules['VMK_bot.config'] = types.SimpleNamespace(TOKEN='123456789:' + 'A' * 35)
+import {module}
+'''
+
+
+def measure_import(module: str = 'VMK_bot.server') -> tuple[float, dict[str, float]]:
+    """Imports module in a fresh interpreter.
+
+    Args:
+        module (str): imported module
+    Returns:
+        tuple[float, dict[str, float]]: total import time in seconds and cumulative import time of every imported module
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', CODE.format(module=module)],
+                            capture_output=True, text=True, check=True).stderr
+
+    total, cumulative = 0.0, {}
+    for line in stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if not line.startswith('import time:') or len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        total += int(fields[0]) / 1e6
+        cumulative[fields[2].strip()] = int(fields[1]) / 1e6
+    return total, cumulative
+
+
+def heavy_modules(modules: dict[str, float]) -> list[str]:
+    """Returns imported top-level packages of PDF ingestion.
+
+    Args:
+        modules (dict[str, float]): imported modules
+    Returns:
+        list[str]
+    """
+    return sorted({name.split('.')[0] for name in modules} & set(HEAVY))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Prints import time of module and checks it doesn't import ingestion dependencies.
+
+    Args:
+        argv (list[str] | None): command line arguments
+    Returns:
+        int: exit code, 1 if ingestion dependencies are imported
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('module', nargs='?', default='VMK_bot.server', help='imported module')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='number of measurements, the fastest is reported')
+    parser.add_argument('-n', '--top', type=int, default=10, help='number of the slowest modules to show')
+    args = parser.parse_args(argv)
+
+    total, modules = min((measure_import(args.module) for _ in range(args.repeat)), key=lambda result: result[0])
+    print(f'import {args.module}: {total * 1e3:.1f} ms')
+    for name, seconds in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'{seconds * 1e3:10.1f} ms  {name}')
+
+    heavy = heavy_modules(modules)
+    if heavy:
+        print(f'{args.module} imports PDF ingestion dependencies: {", ".join(heavy)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
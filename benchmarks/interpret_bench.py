@@ -0,0 +1,92 @@
+"""Benchmark of Parser.interpret_table against row-by-row table interpretation."""
+
+import random
+import timeit
+import pandas as pd
+from VMK_bot.lessons import Lesson, NormalLesson, DoubleLesson
+from VMK_bot.pdf_parser import Parser
+
+TIMES = ('8.45-10.20', '10.30-12.05', '12.50-14.25', '14.35-16.10', '16.20-17.55', '18.00-19.35')
+
+
+def legacy_interpret(df: pd.DataFrame) -> dict:
+    """Table interpretation as it was done before it was vectorized."""
+    data = {}
+    if df[0][0] not in Parser.WEEKDAYS:
+        df = df.iloc[1:, :]
+        df.index = range(len(df))
+    if df.iloc[0, -1] in Parser.WEEKDAYS:  # removing double dates
+        df = df.iloc[:, :-1]
+    i, group_number_filled = 0, False
+    current_weekday, groups = None, None
+    while i < df.shape[0]:
+        match df[0][i].split("-"):
+            case [week_day] if week_day in Parser.WEEKDAYS:
+                if not group_number_filled:
+                    data |= {group_number: {day: [] for day in Parser.WEEKDAYS} for group_number in df.loc[i, 1:]}
+                    groups = [group_number for group_number in df.loc[i, 1:]]
+                    group_number_filled = True
+                current_weekday = week_day
+            case [start_time, end_time] if Lesson.TIME.match(start_time) and Lesson.TIME.match(end_time):
+                start, end = Lesson.to_minutes(start_time), Lesson.to_minutes(end_time)
+                if i + 1 < df.shape[0] and df[0][i] == df[0][i + 1]:
+                    for group_number, lesson_up, lesson_down in zip(groups, df.loc[i, 1:], df.loc[i + 1, 1:]):
+                        day = data[group_number][current_weekday]
+                        if lesson_up == lesson_down:
+                            day.append(NormalLesson(len(day) + 1, start, end, lesson_up))
+                        else:
+                            day.append(DoubleLesson(len(day) + 1, start, end, lesson_up, lesson_down))
+                    i += 1
+                else:
+                    for group_number, lesson in zip(groups, df.loc[i, 1:]):
+                        day = data[group_number][current_weekday]
+                        day.append(NormalLesson(len(day) + 1, start, end, lesson))
+            case _:
+                pass
+        i += 1
+    return data
+
+
+def synthetic_table(groups: int = 30, seed: int = 0) -> pd.DataFrame:
+    """Builds table in camelot format with every weekday, single rows and pairs of odd/even week rows.
+
+    Args:
+        groups (int): number of group columns
+        seed (int): seed of random lessons
+    Returns:
+        pd.DataFrame
+    """
+    rng = random.Random(seed)
+    header = [str(100 + group) for group in range(groups)]
+    rows = [['Расписание'] + [''] * groups]
+    for weekday in Parser.WEEKDAYS:
+        rows.append([weekday] + header)
+        for time in TIMES:
+            up = [rng.choice(('', 'Матанализ 501', 'Алгебра П-8', 'Физкультура')) for _ in range(groups)]
+            rows.append([time] + up)
+            if rng.random() < 0.5:
+                rows.append([time] + [lesson if rng.random() < 0.7 else 'Практикум 707' for lesson in up])
+    return pd.DataFrame(rows)
+
+
+def run(number: int = 20, groups: int = 30) -> dict[str, float]:
+    """Returns mean time of interpreting one synthetic table in milliseconds for both implementations.
+
+    Args:
+        number (int): number of interpreted tables
+        groups (int): number of group columns
+    Returns:
+        dict[str, float]
+    """
+    df = synthetic_table(groups)
+    results = {}
+    for name, interpret in (('legacy', legacy_interpret), ('vectorized', Parser.interpret_table)):
+        results[name] = timeit.timeit(lambda: interpret(df), number=number) / number * 1e3
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    for name, msec in results.items():
+        print(f'{name:>10}: {msec:.2f} ms/table')
+    print(f'{"speedup":>10}: {results["legacy"] / results["vectorized"]:.1f}x')
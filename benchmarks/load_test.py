@@ -0,0 +1,194 @@
+"""Synthetic load test of the bot's dispatcher.
+
+Every simulated user sends /start, a group number, today/tomorrow/week/next lesson buttons and returns to menu,
+waiting until every message is handled. Replies are sent by the outbox in background, so latencies cover handling
+only, while elapsed time lasts until the outbox sent all replies. Users are active concurrently, updates are fed
+straight into the dispatcher of VMK_bot.server with a fake bot and temporary users.db, so the test runs offline.
+"""
+
+import argparse
+import asyncio
+import glob
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import types as modules
+from aiogram import Bot, Dispatcher, types
+from aiogram.dispatcher.handler import current_handler
+from aiogram.dispatcher.middlewares import BaseMiddleware
+from benchmarks.fake_bot import FakeBot, make_update
+from VMK_bot.database import Database
+from VMK_bot.messageUI import MessageToUser
+from VMK_bot.pdf_parser import Parser
+
+BUTTONS = ('Расписание на сегодня  ▶️', 'Расписание на завтра  ⏩', 'Расписание на неделю  ⏭', 'Следующая пара  ⏱',
+           'Вернуться назад  ↩️')
+OFFLINE_CONFIG = {'METRICS_PORT': None, 'BROADCAST_TIME': None, 'SCHEDULE_TABLES': None}
+
+
+class HandlerRecorder(BaseMiddleware):
+    """Middleware remembering which handler processed every message.
+
+    Args:
+        handlers (dict[int, str]): handler names by message id
+    """
+
+    def __init__(self) -> None:
+        """Init method."""
+        super().__init__()
+        self.handlers = {}
+
+    async def on_process_message(self, message: types.Message, data: dict) -> None:
+        """Method to remember handler chosen for message.
+
+        Args:
+            message (types.Message): message from user
+            data (dict): namespace
+        """
+        self.handlers[message.message_id] = current_handler.get().__name__
+
+
+def import_server():
+    """Imports VMK_bot.server configured to run offline.
+
+    Stub config is used if VMK_bot/config.py is missing. Settings of OFFLINE_CONFIG override the config,
+    so the test doesn't serve metrics, broadcast schedule or reload the real pdf tables.
+
+    Returns:
+        module
+    """
+    try:
+        import VMK_bot.config  # noqa: F401
+    except ImportError:
+        sys.modules['VMK_bot.config'] = modules.SimpleNamespace(TOKEN='123456789:' + 'A' * 35)
+    from VMK_bot import server
+    settings = {name: getattr(server.config, name) for name in dir(server.config) if name.isupper()}
+    server.config = modules.SimpleNamespace(**{**settings, **OFFLINE_CONFIG})
+    server.broadcaster.at = None  # broadcaster and outbox read config at import
+    server.outbox.rate = None  # fake bot has no flood control
+    server.outbox.chat_interval = 0.0
+    return server
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Returns percentile of sorted values by nearest-rank method.
+
+    Args:
+        values (list[float]): sorted values
+        percent (float): percentile, e.g. 95
+    Returns:
+        float
+    """
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+async def simulate(users: int, concurrency: int, language: str, throttling: bool, seed: int) -> tuple[float, dict[str, list[float]], FakeBot]:
+    """Runs load test against dispatcher on current database.
+
+    Args:
+        users (int): number of simulated users
+        concurrency (int): maximum number of users active at once
+        language (str): language of users
+        throttling (bool): whether to set up antiflood middleware
+        seed (int): seed of chosen groups
+    Returns:
+        tuple[float, dict[str, list[float]], FakeBot]: elapsed seconds until all replies are sent, handling latencies by handler and fake bot
+    """
+    server = import_server()
+    bot = server.bot = server.dp.bot = server.outbox.bot = FakeBot()
+    dp = server.setup_dispatcher(throttling=throttling)
+    recorder = HandlerRecorder()
+    dp.middleware.setup(recorder)
+    Bot.set_current(bot)
+    Dispatcher.set_current(dp)
+
+    await server.on_startup(dp)
+    rng = random.Random(seed)
+    groups = sorted(server.groups.groups)
+    buttons = [MessageToUser.translate(button, language) for button in BUTTONS]
+    latencies = {}
+    active = asyncio.Semaphore(concurrency)
+
+    async def user(user_id: int) -> None:
+        texts = ['/start', rng.choice(groups)] + buttons
+        async with active:
+            for i, text in enumerate(texts):
+                update_id = user_id * len(texts) + i + 1
+                update = types.Update(**make_update(update_id, text, user_id=user_id, language=language))
+                start = time.perf_counter()
+                await asyncio.create_task(dp.process_update(update))
+                latency = time.perf_counter() - start
+                latencies.setdefault(recorder.handlers.pop(update_id, 'unhandled'), []).append(latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(user_id) for user_id in range(1, users + 1)))
+    await server.outbox.join()
+    elapsed = time.perf_counter() - start
+    await server.on_shutdown(dp)
+    return elapsed, latencies, bot
+
+
+def run(users: int = 1000, concurrency: int = 100, tables: str = 'schedule_tables/*.pdf', language: str = 'ru',
+        throttling: bool = False, seed: int = 0) -> dict:
+    """Imports schedule into temporary database and runs load test.
+
+    Args:
+        users (int): number of simulated users
+        concurrency (int): maximum number of users active at once
+        tables (str): glob of pdf tables to import
+        language (str): language of users
+        throttling (bool): whether to set up antiflood middleware
+        seed (int): seed of chosen groups
+    Returns:
+        dict: throughput, number of sent messages and latency percentiles in seconds by handler
+    """
+    path = Database.PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        Database().close()
+        Database.PATH = os.path.join(tmp, 'users.db')
+        try:
+            for pdf in sorted(glob.glob(tables)):
+                Parser.save_schedule_to_database(Parser.parse_schedule(pdf), pdf)
+            elapsed, latencies, bot = asyncio.run(simulate(users, concurrency, language, throttling, seed))
+        finally:
+            Database().close()
+            Database.PATH = path
+
+    updates = sum(len(values) for values in latencies.values())
+    report = {'updates': updates, 'seconds': elapsed, 'updates_per_second': updates / elapsed,
+              'sent_messages': len(bot.sent_texts()), 'handlers': {}}
+    for handler, values in sorted(latencies.items()):
+        values.sort()
+        report['handlers'][handler] = {'count': len(values),
+                                       **{f'p{percent}': percentile(values, percent) for percent in (50, 95, 99)}}
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Runs load test and prints report.
+
+    Args:
+        argv (list[str] | None): command line arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-u', '--users', type=int, default=1000, help='number of simulated users')
+    parser.add_argument('-c', '--concurrency', type=int, default=100, help='maximum number of users active at once')
+    parser.add_argument('--tables', default='schedule_tables/*.pdf', help='glob of pdf tables to import')
+    parser.add_argument('--language', default='ru', help='language of users')
+    parser.add_argument('--throttling', action='store_true', help='set up antiflood middleware')
+    parser.add_argument('--seed', type=int, default=0, help='seed of chosen groups')
+    args = parser.parse_args(argv)
+
+    report = run(args.users, args.concurrency, args.tables, args.language, args.throttling, args.seed)
+    print(f'{report["updates"]} updates in {report["seconds"]:.2f}s: {report["updates_per_second"]:.0f} updates/s, '
+          f'{report["sent_messages"]} messages sent')
+    print(f'{"handler":>28} {"count":>7} {"p50, ms":>9} {"p95, ms":>9} {"p99, ms":>9}')
+    for handler, stats in report['handlers'].items():
+        print(f'{handler:>28} {stats["count"]:>7} {stats["p50"] * 1e3:>9.2f} {stats["p95"] * 1e3:>9.2f} {stats["p99"] * 1e3:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
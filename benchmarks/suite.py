@@ -0,0 +1,172 @@
+"""Benchmark suite for parsing, import and reply rendering.
+
+Every run records mean time of one call of every benchmark in results.json and compares it with
+baseline.json, failing if some benchmark became slower than the baseline by more than tolerance.
+"""
+
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+from typing import Callable
+from benchmarks.import_time import measure_import
+from VMK_bot.database import Database
+from VMK_bot.messageUI import MessageToUser
+from VMK_bot.pdf_parser import Parser
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS = os.path.join(BENCHMARKS_DIR, 'results.json')
+BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+TABLES = 'schedule_tables/*.pdf'
+MESSAGES = ('Расписание на сегодня  ▶️', 'Расписание на неделю  ⏭', 'Среда', 'Выберите опцию!', 'unknown message')
+LANGUAGES = ('ru', 'en', 'en-US', 'de')
+
+
+def measure(func: Callable[[], object], number: int = 1, repeat: int = 3) -> float:
+    """Returns the best over repeats mean time of one call in seconds.
+
+    Args:
+        func (Callable[[], object]): benchmarked function
+        number (int): number of calls in one repeat
+        repeat (int): number of repeats
+    Returns:
+        float
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def measure_each(func: Callable[..., object], calls: list[tuple], repeat: int = 5) -> float:
+    """Returns the best over repeats mean time of one call in seconds, calling func once with every arguments.
+
+    Args:
+        func (Callable[..., object]): benchmarked function
+        calls (list[tuple]): arguments of calls
+        repeat (int): number of repeats
+    Returns:
+        float
+    """
+    def call_all():
+        for args in calls:
+            func(*args)
+
+    return measure(call_all, repeat=repeat) / max(len(calls), 1)
+
+
+def run(tables: str = TABLES) -> dict[str, float]:
+    """Runs all benchmarks on temporary database.
+
+    Args:
+        tables (str): glob of pdf tables
+    Returns:
+        dict[str, float]: mean time of one call in seconds by benchmark name
+    """
+    results = {'startup[VMK_bot.server]': min(measure_import('VMK_bot.server')[0] for _ in range(3))}
+    path = Database.PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        Database().close()
+        Database.PATH = os.path.join(tmp, 'users.db')
+        try:
+            db = Database()
+            db.connect()
+
+            for pdf in sorted(glob.glob(tables)):
+                name = os.path.basename(pdf)
+                start = time.perf_counter()
+                data = Parser.parse_schedule(pdf)
+                results[f'parse[{name}]'] = time.perf_counter() - start
+                results[f'import[{name}]'] = measure(lambda: Parser.save_schedule_to_database(data, pdf))
+
+            groups = db.get_valid_groups()
+            days = [(group_number, parity, weekday, language) for group_number in groups
+                    for parity in (False, True) for weekday in Parser.WEEKDAYS for language in ('ru', 'en')]
+            weeks = [(group_number, parity, language) for group_number in groups for parity in (False, True) for language in ('ru', 'en')]
+
+            Parser.rendered.clear()
+            results['today[cold]'] = measure_each(Parser.get_today_schedule, days, repeat=1)
+            results['today[warm]'] = measure_each(Parser.get_today_schedule, days)
+            Parser.rendered.clear()
+            results['week[cold]'] = measure_each(Parser.get_week_schedule, weeks, repeat=1)
+            results['week[warm]'] = measure_each(Parser.get_week_schedule, weeks)
+
+            translations = [(message, language) for message in MESSAGES for language in LANGUAGES]
+            results['translate'] = measure_each(MessageToUser.translate, translations * 100)
+
+            users = [(f'user{i}',) for i in range(1000)]
+            for username, in users:
+                db.add_user(username)
+            results['db[get_user]'] = measure_each(db.get_user, users)
+            results['db[get_lessons]'] = measure_each(db.get_lessons, [day[:3] for day in days])
+            results['db[get_valid_groups]'] = measure(db.get_valid_groups, number=100)
+        finally:
+            Database().close()
+            Database.PATH = path
+            Parser.rendered.clear()
+
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Returns names of benchmarks that are slower than baseline by more than tolerance.
+
+    Args:
+        results (dict[str, float]): current results
+        baseline (dict[str, float]): stored results
+        tolerance (float): allowed relative slowdown, e.g. 0.25 for 25%
+    Returns:
+        list[str]
+    """
+    return [name for name, seconds in results.items() if name in baseline and seconds > baseline[name] * (1 + tolerance)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Runs benchmarks and checks them against baseline.
+
+    Args:
+        argv (list[str] | None): command line arguments
+    Returns:
+        int: exit code, 1 if some benchmark regressed
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-t', '--tolerance', type=float, default=0.3, help='allowed relative slowdown against baseline')
+    parser.add_argument('--tables', default=TABLES, help='glob of pdf tables to parse')
+    parser.add_argument('--save-baseline', action='store_true', help='store results as new baseline')
+    args = parser.parse_args(argv)
+
+    results = run(args.tables)
+    with open(RESULTS, 'w') as file:
+        json.dump(results, file, indent=2)
+
+    if args.save_baseline:
+        with open(BASELINE, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f'Baseline saved to {BASELINE}')
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as file:
+            baseline = json.load(file)
+    else:
+        print(f'No baseline at {BASELINE}, nothing to compare with')
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, seconds in results.items():
+        line = f'{name:>28}: {seconds * 1e3:10.4f} ms'
+        if name in baseline:
+            line += f'  (baseline {baseline[name] * 1e3:.4f} ms, {seconds / baseline[name] - 1:+.0%})'
+        if name in regressions:
+            line += '  REGRESSION'
+        print(line)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+"""Micro-benchmark of MessageToUser.translate against per-call gettext lookup."""
+
+import gettext
+import timeit
+from VMK_bot.messageUI import MessageToUser
+
+MESSAGES = ('Расписание на сегодня  ▶️', 'Среда', 'Выберите опцию!', 'unknown message')
+LANGUAGES = ('en', 'ru', 'en-US', 'de')
+
+
+def legacy_translate(message: str, language: str) -> str:
+    """Translation as it was done before catalogs were preloaded."""
+    translation = gettext.translation('user', MessageToUser.TRANSLATION_PATH, languages=[language], fallback=True)
+    return MessageToUser._build_catalog(translation.gettext).get(message, message)
+
+
+def run(number: int = 2000) -> dict[str, float]:
+    """Returns mean time of one call in microseconds for both paths.
+
+    Args:
+        number (int): number of calls for every message and language
+    Returns:
+        dict[str, float]
+    """
+    results = {}
+    for name, translate in (('legacy', legacy_translate), ('preloaded', MessageToUser.translate)):
+        elapsed = timeit.timeit(lambda: [translate(message, language) for message in MESSAGES for language in LANGUAGES],
+                                number=number)
+        results[name] = elapsed / (number * len(MESSAGES) * len(LANGUAGES)) * 1e6
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    for name, usec in results.items():
+        print(f'{name:>10}: {usec:.2f} us/call')
+    print(f'{"speedup":>10}: {results["legacy"] / results["preloaded"]:.0f}x')
@@ -16,11 +16,46 @@ def task_html():
 def task_test():
     """Preform tests."""
     return {
-        'actions': ['python -W ignore::DeprecationWarning -m unittest tests/parser_tests.py -v'],
+        'actions': ['python -W ignore::DeprecationWarning -m unittest discover -s tests -p "*_tests.py" -t . -v'],
         'task_dep': ['translation']
     }
 
 
+def task_bench():
+    """Run benchmarks and compare them with baseline."""
+    return {
+        'actions': ['python -m benchmarks.import_time', 'python -m benchmarks.suite'],
+        'task_dep': ['translation'],
+        'verbosity': 2,
+    }
+
+
+def task_importtime():
+    """Check that serving the bot doesn't import PDF ingestion dependencies."""
+    return {
+        'actions': ['python -m benchmarks.import_time'],
+        'verbosity': 2,
+    }
+
+
+def task_bench_baseline():
+    """Run benchmarks and store them as new baseline."""
+    return {
+        'actions': ['python -m benchmarks.suite --save-baseline'],
+        'task_dep': ['translation'],
+        'verbosity': 2,
+    }
+
+
+def task_load():
+    """Run offline load test of dispatcher."""
+    return {
+        'actions': ['python -m benchmarks.load_test'],
+        'task_dep': ['translation'],
+        'verbosity': 2,
+    }
+
+
 def task_pot():
     """Re-create .pot ."""
     return {
@@ -0,0 +1,45 @@
+from benchmarks.import_time import heavy_modules, measure_import
+from benchmarks.load_test import import_server, percentile, run
+from benchmarks.suite import MESSAGES, compare, measure
+from VMK_bot.messageUI import MessageToUser
+import unittest
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_compare(self):
+        baseline = {'parse': 1.0, 'translate': 1e-6}
+        self.assertEqual(compare({'parse': 1.2, 'translate': 2e-6, 'new': 5.0}, baseline, 0.25), ['translate'])
+        self.assertEqual(compare({'parse': 0.5}, baseline, 0.0), [])
+
+    def test_messages(self):
+        self.assertEqual(set(MESSAGES) - set(MessageToUser.catalogs[MessageToUser.DEFAULT_LANGUAGE]), {'unknown message'})
+
+    def test_measure(self):
+        calls = []
+        self.assertGreaterEqual(measure(lambda: calls.append(1), number=5, repeat=2), 0)
+        self.assertEqual(len(calls), 10)
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual([percentile(values, percent) for percent in (50, 95, 99, 100)], [50.0, 95.0, 99.0, 100.0])
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+    def test_load_test(self):
+        report = run(users=3, concurrency=2, tables='tests/test_tables/example.pdf')
+        self.assertEqual(report['updates'], 21)
+        self.assertEqual(set(report['handlers']), {'cmd_start', 'handle_number', 'cmd_today_schedule', 'cmd_tomorrow_schedule',
+                                                   'cmd_week_schedule', 'cmd_next_lesson', 'cmd_cancel'})
+        self.assertEqual(report['sent_messages'], 21)  # two replies to /start and to return to menu are coalesced
+
+    def test_offline_server(self):
+        server = import_server()  # VMK_bot/config.py may exist and enable them
+        self.assertIsNone(server.config.METRICS_PORT)
+        self.assertIsNone(server.config.BROADCAST_TIME)
+        self.assertIsNone(server.config.SCHEDULE_TABLES)
+        self.assertIsNone(server.broadcaster.at)
+
+    def test_server_import(self):
+        self.assertEqual(heavy_modules({'camelot.core': 0.1, 'numpy': 0.1, 'aiogram': 0.1}), ['camelot', 'numpy'])
+        total, modules = measure_import('VMK_bot.server')
+        self.assertIn('VMK_bot.schedule', modules)
+        self.assertEqual(heavy_modules(modules), [])
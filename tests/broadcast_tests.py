@@ -0,0 +1,85 @@
+from aiogram.utils.exceptions import BotBlocked, RetryAfter
+from benchmarks.fake_bot import FakeBot
+from datetime import datetime, time
+from VMK_bot.broadcast import Broadcaster
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.lessons import NormalLesson
+from VMK_bot.outbound import Outbox
+from VMK_bot.schedule import Schedule
+from VMK_bot.users import UserStore
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+
+class FloodBot(FakeBot):
+    """Fake bot answering RetryAfter to the first message to chat 1, chat 2 blocked it."""
+
+    def __init__(self):
+        super().__init__()
+        self.flooded = False
+
+    async def request(self, method, data=None, files=None, **kwargs):
+        if data['chat_id'] == 1 and not self.flooded:
+            self.flooded = True
+            raise RetryAfter(0)
+        if data['chat_id'] == 2:
+            raise BotBlocked('Forbidden: bot was blocked by the user')
+        return await super().request(method, data, files, **kwargs)
+
+
+class FrozenDatetime(datetime):
+    """Datetime whose now() is Tuesday morning, the day broadcast in tests is for."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2023, 5, 9, 9)
+
+
+class TestBroadcaster(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        Schedule.rendered.clear()
+        self.adb = AsyncDatabase(readers=1)
+        await self.adb.start()
+        await self.adb.write(Database().import_schedule, 'example.pdf',
+                             [('101', True, 1, NormalLesson(1, 525, 620, 'Матанализ')),
+                              ('102', True, 1, NormalLesson(1, 525, 620, 'Алгебра'))])
+
+    async def asyncTearDown(self):
+        await self.adb.close()
+        Database().close()
+        Database.PATH = 'users.db'
+        Schedule.rendered.clear()
+        self.tmp.cleanup()
+
+    def test_seconds_until(self):
+        self.assertEqual(Broadcaster.seconds_until(time(20), datetime(2023, 5, 1, 19, 30)), 1800)
+        self.assertEqual(Broadcaster.seconds_until(time(20), datetime(2023, 5, 1, 20, 0)), 86400)
+
+    async def test_broadcast(self):
+        users = UserStore(self.adb)
+        for user_id, group_number, language in ((1, '101', 'ru'), (2, '101', 'ru'), (3, '101', 'en'), (4, '102', 'ru')):
+            users.add_user(f'user{user_id}')
+            users.set_group(f'user{user_id}', group_number)
+            users.set_subscription(f'user{user_id}', user_id, language, True)
+        users.set_subscription('user4', 4, 'ru', False)
+        await users.stop()
+
+        bot = FloodBot()
+        outbox = Outbox(bot, rate=None, chat_interval=0.0)
+        outbox.start()
+        misses = Schedule.rendered.misses
+        broadcaster = Broadcaster(outbox, self.adb)
+        with unittest.mock.patch('VMK_bot.schedule.datetime', FrozenDatetime):  # lessons aren't marked whatever day it is
+            self.assertEqual(await broadcaster.broadcast(datetime(2023, 5, 8, 20)), 2)  # tomorrow is Tuesday of odd week
+        self.assertEqual(sorted(bot.sent_texts()), ['Here your schedule for tomorrow\n<b>Tuesday</b>\n1) (8.45-10.20) Матанализ ',
+                                                    'Держите ваше расписание на завтра\n<b>Вторник</b>\n1) (8.45-10.20) Матанализ '])
+        self.assertEqual(Schedule.rendered.misses - misses, 2)  # rendered once per group and language
+        self.assertEqual(await self.adb.read(Database().get_subscribers), [('101', 'en', 3), ('101', 'ru', 1)])
+
+        self.assertEqual(await broadcaster.broadcast(datetime(2023, 5, 13, 20)), 0)  # tomorrow is Sunday
+        await outbox.stop()
@@ -0,0 +1,27 @@
+from VMK_bot.cache import LRUCache
+import unittest
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.put('a', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,152 @@
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.lessons import NormalLesson
+from VMK_bot.schedule import Schedule
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+
+    def tearDown(self):
+        Database().close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    def test_lessons(self):
+        db = Database()
+        db.connect()
+        db.import_schedule('example.pdf', [('101', True, 0, NormalLesson(1, 525, 620, 'Матанализ')),
+                                           ('101', True, 5, NormalLesson(2, 630, 725, 'Физра'))])
+        self.assertEqual(db.get_lessons('101', True, 'Понедельник'), [NormalLesson(1, 525, 620, 'Матанализ')])
+        self.assertEqual(db.get_lessons('101', True, 'Суббота'), [NormalLesson(2, 630, 725, 'Физра')])
+        self.assertEqual(db.get_lessons('101', False, 'Понедельник'), [])
+        self.assertEqual(db.get_valid_groups(), ['101'])
+
+    def test_reimport_and_rollback(self):
+        db = Database()
+        db.connect()
+        first = db.import_schedule('example.pdf', [('101', True, 0, NormalLesson(1, 525, 620, 'Матанализ')),
+                                                   ('102', True, 0, NormalLesson(1, 525, 620, 'Алгебра'))])
+        db.import_schedule('example2.pdf', [('201', True, 0, NormalLesson(1, 525, 620, 'Физика'))])
+        second = db.import_schedule('example.pdf', [('101', True, 0, NormalLesson(2, 630, 725, 'Матанализ'))])
+        self.assertEqual(db.get_lessons('101', True, 'Понедельник'), [NormalLesson(2, 630, 725, 'Матанализ')])
+        self.assertEqual(sorted(db.get_valid_groups()), ['101', '201'])
+
+        third = db.import_schedule('example.pdf', [('101', True, 0, NormalLesson(3, 770, 865, 'Матанализ'))])
+        self.assertNotIn(first, [version for version, *_ in db.get_schedule_versions()])
+        db.update_manifest('example.pdf', 5, 10, 'hash', third)
+
+        db.rollback_schedule(third)
+        self.assertEqual(db.get_manifest_entry('example.pdf'), (5, 10, 'hash', second))
+        self.assertEqual(db.get_lessons('101', True, 'Понедельник'), [NormalLesson(2, 630, 725, 'Матанализ')])
+        self.assertEqual(sorted(db.get_valid_groups()), ['101', '201'])
+        self.assertEqual([version for version, _, _, active in db.get_schedule_versions() if active][-1], second)
+        with self.assertRaises(ValueError):
+            db.rollback_schedule(third)
+
+    def test_rendered(self):
+        db = Database()
+        db.connect()
+        db.import_schedule('example.pdf', [('101', True, 0, NormalLesson(1, 525, 620, 'Матанализ')),
+                                           ('102', True, 5, NormalLesson(2, 630, 725, 'Физра'))])
+        self.assertGreater(Schedule.prerender(), 0)
+        self.assertEqual(db.get_rendered('101', True, 'Понедельник', 'ru'),
+                         ('<b>Понедельник</b>\n1) (8.45-10.20) Матанализ', '[[525, 620]]'))
+        self.assertEqual(db.get_rendered('101', True, 'week', 'ru')[0], Schedule.render_week_schedule('101', True, 'ru'))
+        self.assertEqual(Schedule.load_day_schedule('102', True, 'Суббота', 'ru'), Schedule.render_day_schedule('102', True, 'Суббота', 'ru'))
+
+        db.import_schedule('example.pdf', [('101', True, 0, NormalLesson(2, 630, 725, 'Матанализ'))])
+        self.assertIsNone(db.get_rendered('101', True, 'Понедельник', 'ru'))  # rendered from inactive version
+        self.assertEqual(Schedule.load_day_schedule('101', True, 'Понедельник', 'ru'),
+                         ('<b>Понедельник</b>', [('2) (10.30-12.05) Матанализ', 630, 725)]))
+
+    def test_lessons_migration(self):
+        legacy = sqlite3.connect(Database.PATH)
+        legacy.execute('CREATE TABLE lessons(group_number TEXT, parity BOOL, weekday INTEGER, slot INTEGER,'
+                       'start INTEGER, end INTEGER, description TEXT)')
+        legacy.execute('INSERT INTO lessons VALUES(?, ?, ?, ?, ?, ?, ?)', ('101', False, 0, 1, 525, 620, 'Матанализ'))
+        legacy.commit()
+        legacy.close()
+
+        db = Database()
+        db.connect()
+        self.assertEqual(db.get_lessons('101', False, 'Понедельник'), [NormalLesson(1, 525, 620, 'Матанализ')])
+        db.import_schedule('example2.pdf', [('201', True, 0, NormalLesson(1, 525, 620, 'Физика'))])
+        self.assertEqual(sorted(db.get_valid_groups()), ['101', '201'])
+
+    def test_students_migration(self):
+        legacy = sqlite3.connect(Database.PATH)
+        legacy.execute('CREATE TABLE students(username TEXT PRIMARY KEY, group_number TEXT, state TEXT)')
+        legacy.execute('INSERT INTO students VALUES(?, ?, ?)', ('student', '101', 'final'))
+        legacy.commit()
+        legacy.close()
+
+        db = Database()
+        db.connect()
+        db.update_users({'student': {'chat_id': 1, 'language': 'ru', 'subscribed': 1}})
+        self.assertEqual(db.get_user('student'), ('final', '101'))
+        self.assertEqual(db.cur.execute('SELECT chat_id, language, subscribed FROM students').fetchall(), [(1, 'ru', 1)])
+
+    def test_schedule_migration(self):
+        legacy = sqlite3.connect(Database.PATH)
+        legacy.execute('CREATE TABLE schedule(group_number TEXT, parity BOOL, Понедельник TEXT, Вторник TEXT,'
+                       'Среда TEXT, Четверг TEXT, Пятница TEXT, Суббота TEXT)')
+        monday = json.dumps(["0 8.45 10.20 'Матанализ'", "0 10.30 12.05 ''", "0 12.50 14.25 'Алгебра'"])
+        legacy.execute('INSERT INTO schedule VALUES(?, ?, ?, ?, ?, ?, ?, ?)', ('101', False, monday, *['[]'] * 5))
+        legacy.commit()
+        legacy.close()
+
+        db = Database()
+        db.connect()
+        self.assertEqual(db.get_lessons('101', False, 'Понедельник'),
+                         [NormalLesson(1, 525, 620, 'Матанализ'), NormalLesson(3, 770, 865, 'Алгебра')])
+        tables = db.cur.execute("SELECT name FROM sqlite_master WHERE type=='table'").fetchall()
+        self.assertNotIn(('schedule',), tables)
+
+    def test_fsm(self):
+        db = Database()
+        db.connect()
+        db.update_fsm({('1', '1'): {'state': 'StudentGroupState:final'}, ('2', '2'): {'data': '{"group": "101"}'}})
+        self.assertEqual(db.get_fsm('1', '1'), ('StudentGroupState:final', '{}'))
+        self.assertEqual(db.get_fsm('2', '2'), (None, '{"group": "101"}'))
+        db.update_fsm({('1', '1'): {'state': None}, ('2', '2'): {'state': 'StudentGroupState:processing'}})
+        self.assertIsNone(db.get_fsm('1', '1'))
+        self.assertEqual(db.get_fsm('2', '2'), ('StudentGroupState:processing', '{"group": "101"}'))
+
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        self.adb = AsyncDatabase(readers=2)
+        await self.adb.start()
+
+    async def asyncTearDown(self):
+        await self.adb.close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    async def test_read_after_write(self):
+        db = Database()
+        await self.adb.write(db.add_user, 'student')
+        await self.adb.write(db.update_users, {'student': {'group_number': '101'}})
+        self.assertEqual(await self.adb.read(db.get_user, 'student'), ('processing', '101'))
+        self.assertIsNone(await self.adb.read(db.get_user, 'unknown'))
+
+    async def test_closed(self):
+        await self.adb.close()
+        with self.assertRaises(RuntimeError):
+            await self.adb.read(Database().get_user, 'student')
+        with self.assertRaises(RuntimeError):
+            await self.adb.write(Database().add_user, 'student')
+
+    async def test_wal_mode(self):
+        mode = await self.adb.read(lambda: Database().cur.execute('PRAGMA journal_mode').fetchone()[0])
+        self.assertEqual(mode, 'wal')
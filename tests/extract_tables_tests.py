@@ -0,0 +1,95 @@
+from VMK_bot import extract_tables
+from VMK_bot.database import Database
+from unittest import mock
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        Database().connect()
+        self.pdf = os.path.join(self.tmp.name, 'example.pdf')
+        self.write(b'first')
+
+    def tearDown(self):
+        Database().close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    def write(self, content, mtime_ns=None):
+        with open(self.pdf, 'wb') as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.pdf, ns=(mtime_ns, mtime_ns))
+
+    def record(self, version=1):
+        for path, stamp in extract_tables.find_changed_tables([self.pdf]).items():
+            Database().update_manifest(path, *stamp, version)
+
+    def test_file_hash(self):
+        self.assertEqual(extract_tables.file_hash(self.pdf, chunk_size=2), hashlib.md5(b'first').hexdigest())
+
+    def test_new_file(self):
+        self.assertEqual(list(extract_tables.find_changed_tables([self.pdf])), [self.pdf])
+
+    def test_unchanged_file_is_not_read(self):
+        self.record()
+        with mock.patch.object(extract_tables, 'file_hash') as file_hash:
+            self.assertEqual(extract_tables.find_changed_tables([self.pdf]), {})
+        file_hash.assert_not_called()
+
+    def test_touched_file(self):
+        self.record()
+        self.write(b'first', mtime_ns=10 ** 18)
+        self.assertEqual(extract_tables.find_changed_tables([self.pdf]), {})
+        self.assertEqual(Database().get_manifest_entry(self.pdf), (5, 10 ** 18, hashlib.md5(b'first').hexdigest(), 1))
+
+    def test_changed_file(self):
+        self.record()
+        self.write(b'second', mtime_ns=10 ** 18)
+        self.assertEqual(list(extract_tables.find_changed_tables([self.pdf])), [self.pdf])
+
+    def test_legacy_hash(self):
+        Database().cur.execute('INSERT INTO hashes VALUES(?)', (hashlib.md5(b'first').hexdigest(),))
+        self.assertEqual(extract_tables.find_changed_tables([self.pdf]), {})
+        self.assertIsNone(Database().get_manifest_entry(self.pdf)[3])
+
+
+class TestImportTables(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tables = os.path.join(self.tmp.name, 'schedule_tables')
+        os.mkdir(self.tables)
+        for name in ('example.pdf', 'example2.pdf'):
+            shutil.copy(os.path.join('tests', 'test_tables', name), self.tables)
+
+    def tearDown(self):
+        Database().close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    def import_into(self, name, jobs):
+        """Imports tables into a new database, returns imported tables and contents of schedule tables."""
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, name)
+        imported = extract_tables.import_tables(jobs=jobs, directory=self.tables)
+        cur = Database().cur
+        contents = {table: sorted(cur.execute(f'SELECT {columns} FROM {table}').fetchall())
+                    for table, columns in (('pdf_manifest', '*'), ('active_groups', '*'), ('lessons', '*'), ('rendered', '*'),
+                                           ('schedule_versions', 'version, source'))}
+        return imported, contents
+
+    def test_parallel_import(self):
+        serial = self.import_into('serial.db', jobs=1)
+        with mock.patch.object(extract_tables, 'ProcessPoolExecutor', wraps=extract_tables.ProcessPoolExecutor) as pool:
+            parallel = self.import_into('parallel.db', jobs=2)
+        pool.assert_called_once_with(max_workers=2)
+        self.assertEqual(serial[0], [os.path.join(self.tables, name) for name in ('example.pdf', 'example2.pdf')])
+        self.assertEqual(len(serial[1]['pdf_manifest']), 2)
+        self.assertEqual(parallel, serial)
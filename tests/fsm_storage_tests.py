@@ -0,0 +1,57 @@
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.fsm_storage import SQLiteStorage
+import os
+import tempfile
+import unittest
+
+
+class TestSQLiteStorage(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        self.adb = AsyncDatabase(readers=2)
+        await self.adb.start()
+        self.storage = SQLiteStorage(self.adb, maxsize=2)
+
+    async def asyncTearDown(self):
+        await self.storage.close()
+        await self.adb.close()
+        Database().close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    async def test_state_and_data(self):
+        self.assertIsNone(await self.storage.get_state(chat=1, user=1))
+        self.assertEqual(await self.storage.get_state(chat=1, user=1, default='processing'), 'processing')
+        await self.storage.set_state(chat=1, user=1, state='StudentGroupState:final')
+        await self.storage.update_data(chat=1, user=1, group='319/1')
+        await self.storage.update_data(chat=1, user=1, data={'lang': 'en'})
+        self.assertEqual(await self.storage.get_state(chat=1, user=1), 'StudentGroupState:final')
+        data = await self.storage.get_data(chat=1, user=1)
+        self.assertEqual(data, {'group': '319/1', 'lang': 'en'})
+        data['group'] = '101'
+        self.assertEqual((await self.storage.get_data(chat=1, user=1))['group'], '319/1')
+
+    async def test_persistence(self):
+        await self.storage.set_state(chat=1, user=1, state='StudentGroupState:final')
+        await self.storage.set_data(chat=1, user=1, data={'group': '101'})
+        await self.storage.close()
+
+        storage = SQLiteStorage(self.adb)
+        self.assertEqual(await storage.get_state(chat=1, user=1), 'StudentGroupState:final')
+        self.assertEqual(await storage.get_data(chat=1, user=1), {'group': '101'})
+        await storage.finish(chat=1, user=1)
+        await storage.close()
+        self.assertIsNone(await self.adb.read(Database().get_fsm, '1', '1'))
+
+    async def test_evicted_pending_changes(self):
+        for user in range(5):
+            await self.storage.get_state(chat=user, user=user)
+            await self.storage.set_state(chat=user, user=user, state=f'state{user}')
+        self.assertEqual(len(self.storage.cache), 2)
+        for user in range(5):
+            self.assertEqual(await self.storage.get_state(chat=user, user=user), f'state{user}')
+        await self.storage.buffer.flush()
+        self.storage.cache.clear()
+        self.assertEqual(await self.storage.get_state(chat=0, user=0), 'state0')
@@ -0,0 +1,37 @@
+from VMK_bot.database import Database
+from VMK_bot.groups import GroupRegistry
+from VMK_bot.lessons import NormalLesson
+import os
+import tempfile
+import unittest
+
+
+class TestGroupRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        db = Database()
+        db.connect()
+        db.import_schedule('example.pdf', [('319/1', True, 0, NormalLesson(1, 525, 620, 'Матанализ')),
+                                           ('101', True, 0, NormalLesson(1, 525, 620, 'Алгебра'))])
+        self.groups = GroupRegistry()
+        self.groups.refresh()
+
+    def tearDown(self):
+        self.groups._index = None
+        Database().close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    def test_resolve(self):
+        self.assertEqual(self.groups.groups, frozenset({'319/1', '101'}))
+        for text in ('319/1', '319-1', '319 1', ' 319 - 1 '):
+            self.assertEqual(self.groups.resolve(text), '319/1')
+            self.assertIn(text, self.groups)
+        self.assertEqual(self.groups.resolve('101'), '101')
+
+    def test_unknown_group(self):
+        for text in ('999', '319-2', '', None):
+            self.assertIsNone(self.groups.resolve(text))
+            self.assertNotIn(text, self.groups)
@@ -0,0 +1,22 @@
+from VMK_bot.keyboards import Keyboards
+from VMK_bot.messageUI import MessageToUser
+import tempfile
+import unittest
+import unittest.mock
+
+
+class TestKeyboards(unittest.TestCase):
+    def tearDown(self):
+        MessageToUser.load()
+
+    def test_cache(self):
+        kb = Keyboards.get_cancel_kb('en')
+        self.assertIn('Return to menu', kb)
+        self.assertIs(Keyboards.get_cancel_kb('en'), kb)
+        self.assertEqual(Keyboards.get_cancel_kb('en-US'), kb)
+
+    def test_rebuilt_after_load(self):
+        self.assertNotIn('Вернуться назад', Keyboards.get_cancel_kb('en'))
+        with tempfile.TemporaryDirectory() as tmp, unittest.mock.patch.object(MessageToUser, 'TRANSLATION_PATH', tmp):
+            MessageToUser.load()  # only Russian is left
+        self.assertIn('Вернуться назад', Keyboards.get_cancel_kb('en'))
@@ -0,0 +1,15 @@
+from VMK_bot.messageUI import MessageToUser
+import unittest
+
+
+class TestMessageToUser(unittest.TestCase):
+    def test_resolve_language(self):
+        for language in ('en', 'en-US', 'en_GB', 'EN-us'):
+            self.assertEqual(MessageToUser.resolve_language(language), 'en')
+        for language in ('ru', 'xx', 'uk-UA', '', None):
+            self.assertEqual(MessageToUser.resolve_language(language), 'ru')
+
+    def test_translate(self):
+        self.assertEqual(MessageToUser.translate('Понедельник', 'en-US'), 'Monday')
+        self.assertEqual(MessageToUser.translate('Понедельник', 'xx'), 'Понедельник')
+        self.assertEqual(MessageToUser.translate('Unknown message', 'en'), 'Unknown message')
@@ -0,0 +1,98 @@
+from aiogram import Bot, Dispatcher, types
+from benchmarks.fake_bot import FakeBot, make_update
+from benchmarks.load_test import import_server
+from VMK_bot.cache import LRUCache
+from VMK_bot.metrics import Counter, Histogram, Metrics, format_sample
+from VMK_bot.outbound import Outbox
+import asyncio
+import socket
+import unittest
+import unittest.mock
+
+
+class TestMetrics(unittest.TestCase):
+    def test_format_sample(self):
+        self.assertEqual(format_sample('vmk_total', {}, 3), 'vmk_total 3')
+        self.assertEqual(format_sample('vmk_seconds', {'handler': 'a"b\\c\n'}, 0.5),
+                         'vmk_seconds{handler="a\\"b\\\\c\\n"} 0.5')
+
+    def test_counter(self):
+        counter = Counter('vmk_total', 'Help.', ('handler',))
+        counter.inc('cmd_start')
+        counter.inc('cmd_start', amount=2)
+        self.assertEqual(list(counter.samples()), [('vmk_total', {'handler': 'cmd_start'}, 3)])
+
+    def test_histogram(self):
+        histogram = Histogram('vmk_seconds', 'Help.', ('handler',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, 'cmd_help')
+        self.assertEqual(histogram.count('cmd_help'), 4)
+        self.assertEqual(histogram.count('cmd_start'), 0)
+        self.assertEqual([(name, labels.get('le'), value) for name, labels, value in histogram.samples()],
+                         [('vmk_seconds_bucket', '0.1', 2), ('vmk_seconds_bucket', '1.0', 3), ('vmk_seconds_bucket', '+Inf', 4),
+                          ('vmk_seconds_sum', None, 2.65), ('vmk_seconds_count', None, 4)])
+
+    def test_render(self):
+        metrics = Metrics()
+        cache = LRUCache()
+        cache.put('key', 'value')
+        cache.get('key')
+        cache.get('other')
+        metrics.track_cache('test', cache)
+        metrics.throttled.inc()
+        text = metrics.render()
+        self.assertIn('# TYPE vmk_handler_seconds histogram\n', text)
+        self.assertIn('vmk_cache_hit_ratio{cache="test"} 0.5\n', text)
+        self.assertIn('vmk_cache_entries{cache="test"} 1\n', text)
+        self.assertRegex(text, r'\nvmk_throttled_total \d+\n')
+
+    def test_database_latency(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from VMK_bot.database import AsyncDatabase
+
+        async def run():
+            adb = AsyncDatabase()
+            adb._read_pool = ThreadPoolExecutor(max_workers=1)  # no database is needed
+            await adb.read(sorted, [2, 1])
+            adb._read_pool.shutdown()
+
+        before = Metrics().db_seconds.count('read', 'sorted')
+        asyncio.run(run())
+        self.assertEqual(Metrics().db_seconds.count('read', 'sorted'), before + 1)
+
+
+class TestMetricsEndpoint(unittest.IsolatedAsyncioTestCase):
+    async def test_busy_port(self):
+        with socket.socket() as busy:
+            busy.bind(('127.0.0.1', 0))
+            busy.listen()
+            metrics = Metrics()
+            with self.assertLogs('VMK_bot.metrics', 'WARNING'):
+                await metrics.serve('127.0.0.1', busy.getsockname()[1])
+            await metrics.stop()
+
+
+class TestMetricsMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def test_throttled_updates(self):
+        server = import_server()
+        bot = FakeBot()
+        dp = Dispatcher(bot)
+        dp.middleware.setup(server.MetricsMiddleware())
+        dp.middleware.setup(server.ThrottlingMiddleware(rate=0.001, burst=2))
+
+        async def cmd_metered(message: types.Message):
+            pass
+
+        dp.register_message_handler(cmd_metered)
+        Bot.set_current(bot)
+        Dispatcher.set_current(dp)
+        metrics = Metrics()
+        before = (metrics.requests.values.get(('throttled',), 0), metrics.handler_seconds.count('throttled'))
+        with unittest.mock.patch.object(server, 'outbox', Outbox(bot)):  # warning isn't left for other tests
+            for update_id in range(1, 6):
+                await dp.process_update(types.Update(**make_update(update_id, 'text', user_id=1)))
+
+        self.assertEqual(metrics.requests.values[('cmd_metered',)], 2)
+        self.assertEqual(metrics.handler_seconds.count('cmd_metered'), 2)
+        self.assertEqual((metrics.requests.values[('throttled',)], metrics.handler_seconds.count('throttled')),
+                         (before[0] + 3, before[1] + 3))
@@ -0,0 +1,107 @@
+from aiogram.utils.exceptions import BotBlocked, NetworkError, RetryAfter
+from benchmarks.fake_bot import FakeBot
+from VMK_bot.outbound import Outbox
+import asyncio
+import unittest
+
+
+class SlowBot(FakeBot):
+    """Fake bot counting concurrent requests, the first request to chat 1 gets RetryAfter and to chat 2 fails."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = self.max_active = 0
+        self.errors = {1: RetryAfter(0), 2: NetworkError('Connection reset')}
+
+    async def request(self, method, data=None, files=None, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            error = self.errors.pop(data['chat_id'], None)
+            if error is not None:
+                raise error
+            return await super().request(method, data, files, **kwargs)
+        finally:
+            self.active -= 1
+
+
+class TestOutbox(unittest.IsolatedAsyncioTestCase):
+    async def test_order_and_coalescing(self):
+        bot = FakeBot()
+        outbox = Outbox(bot, workers=2, chat_interval=0.0)
+        outbox.send(1, 'a', reply_markup='kb')
+        outbox.send(1, 'b', reply_markup='kb')
+        outbox.send(1, 'c', reply_to_message_id=1)
+        outbox.send(1, 'd', parse_mode='HTML')
+        outbox.send(1, 'e', parse_mode='HTML', reply_markup='kb2')
+        self.assertEqual(len(outbox), 5)
+        outbox.start()
+        await outbox.stop()
+        self.assertEqual(bot.sent_texts(), ['a\n\nb', 'c', 'd\n\ne'])
+        self.assertEqual(bot.requests[-1][1]['reply_markup'], 'kb2')
+        self.assertEqual(len(outbox), 0)
+
+    async def test_concurrency_and_retries(self):
+        bot = SlowBot()
+        outbox = Outbox(bot, workers=3, rate=None, chat_interval=0.0, backoff=0.01)
+        outbox.start()
+        for chat_id in range(1, 11):
+            outbox.send(chat_id, str(chat_id))
+        await asyncio.wait_for(outbox.join(), 5)
+        await outbox.stop()
+        self.assertEqual(sorted(bot.sent_texts(), key=int), [str(chat_id) for chat_id in range(1, 11)])
+        self.assertEqual(bot.max_active, 3)
+
+    async def test_bulk_after_replies(self):
+        bot = FakeBot()
+        outbox = Outbox(bot, workers=1, rate=None, chat_interval=0.0)
+        sending = [outbox.send_bulk(chat_id, f'bulk{chat_id}') for chat_id in (1, 2)]
+        outbox.send(3, 'reply')
+        outbox.start()
+        self.assertEqual(await asyncio.wait_for(asyncio.gather(*sending), 5), ['sent', 'sent'])
+        await outbox.stop()
+        self.assertEqual(bot.sent_texts(), ['reply', 'bulk1', 'bulk2'])
+
+    async def test_rate(self):
+        bot = FakeBot()
+        outbox = Outbox(bot, workers=4, rate=50.0)
+        outbox.start()
+        start = asyncio.get_running_loop().time()
+        for chat_id in range(1, 7):
+            outbox.send(chat_id, str(chat_id))
+        await asyncio.wait_for(outbox.join(), 5)
+        self.assertGreaterEqual(asyncio.get_running_loop().time() - start, 0.1)  # 6 messages at 50 per second
+        await outbox.stop()
+
+    async def test_flood_control_and_blocked(self):
+        bot = SlowBot()
+        bot.errors = {1: RetryAfter(0.2), 3: BotBlocked('Forbidden: bot was blocked by the user')}
+        outbox = Outbox(bot, workers=2, rate=None, chat_interval=0.0)
+        outbox.start()
+        start = asyncio.get_running_loop().time()
+        flooded = outbox.send_bulk(1, '1')
+        await asyncio.sleep(0.05)
+        sending = [outbox.send_bulk(chat_id, str(chat_id)) for chat_id in (2, 3)]
+        self.assertEqual(await asyncio.wait_for(asyncio.gather(flooded, *sending), 5), ['sent', 'sent', 'blocked'])
+        self.assertGreaterEqual(asyncio.get_running_loop().time() - start, 0.2)  # RetryAfter pauses other chats too
+        await outbox.stop()
+        self.assertEqual(sorted(bot.sent_texts()), ['1', '2'])
+
+    async def test_chat_interval(self):
+        bot = FakeBot()
+        sent = {}
+
+        async def record(chat_id, text, **kwargs):
+            sent[text] = asyncio.get_running_loop().time()
+
+        bot.send_message = record
+        outbox = Outbox(bot, workers=2, rate=None, chat_interval=0.2)
+        outbox.start()
+        outbox.send(1, 'reply', reply_to_message_id=1)
+        broadcast = outbox.send_bulk(1, 'bulk')
+        outbox.send(2, 'other')
+        self.assertEqual(await asyncio.wait_for(broadcast, 5), 'sent')
+        await outbox.stop()
+        self.assertGreaterEqual(abs(sent['bulk'] - sent['reply']), 0.2)  # different workers, but not at the same moment
+        self.assertLess(sent['other'] - min(sent.values()), 0.2)  # other chats don't wait
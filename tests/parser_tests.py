@@ -1,3 +1,7 @@
+import camelot
+import glob
+import pypdf
+from benchmarks.interpret_bench import legacy_interpret, synthetic_table
 from VMK_bot.pdf_parser import Parser
 import unittest
 
@@ -33,3 +37,31 @@ class TestParser(unittest.TestCase):
                          {'401', '402', '403', '404', '405', '406', '407', '409', '411', '412', '413', '414', '415',
                           '416', '417', '418', '419/1', '419/2', '420', '421', '423', '424', '425', '427', '428',
                           '441/1', '441/2'})
+
+    def test_split_pages(self):
+        self.assertEqual(Parser.split_pages(4, 2), ['1-2', '3-4'])
+        self.assertEqual(Parser.split_pages(5, 3), ['1', '2-3', '4-5'])
+        self.assertEqual(Parser.split_pages(2, 8), ['1', '2'])
+
+    def test_parallel_parse(self):
+        for path in sorted(glob.glob('tests/test_tables/example*.pdf')):
+            serial = Parser.parse_schedule(path)
+            pages = len(pypdf.PdfReader(path).pages)
+            for jobs in (2, pages + 2):  # more parts than pages are split into one page per part
+                with self.subTest(path=path, jobs=jobs):
+                    self.assertEqual(Parser.parse_schedule(path, jobs=jobs), serial)
+
+    def test_interpret_table(self):
+        for groups, seed in ((1, 0), (7, 1), (30, 2)):
+            df = synthetic_table(groups, seed)
+            self.assertEqual(Parser.interpret_table(df), legacy_interpret(df))
+
+    def test_interpret_table_repeated_groups(self):
+        df = synthetic_table(4)
+        df.iloc[1:, 3] = df.iloc[1:, 1]
+        self.assertEqual(Parser.interpret_table(df), legacy_interpret(df))
+
+    def test_interpret_tables(self):
+        for name in ('example', 'example2', 'example3', 'example4'):
+            for page in camelot.read_pdf(f"tests/test_tables/{name}.pdf", line_scale=110, copy_text=['v', 'h'], pages='all'):
+                self.assertEqual(Parser.interpret_table(page.df), legacy_interpret(page.df))
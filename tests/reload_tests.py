@@ -0,0 +1,116 @@
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.groups import GroupRegistry
+from VMK_bot.reload import DirectoryWatcher, ScheduleReloader
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+
+
+class PollingWatcher(DirectoryWatcher):
+    """Watcher that can't use inotify."""
+
+    def _init_inotify(self):
+        return None
+
+
+class TestDirectoryWatcher(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    async def asyncTearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name):
+        with open(os.path.join(self.tmp.name, name), 'wb') as f:
+            f.write(b'%PDF')
+
+    async def test_inotify(self):
+        watcher = DirectoryWatcher(self.tmp.name)
+        watcher.start()
+        if not watcher.inotify:
+            await watcher.stop()
+            self.skipTest('inotify is not available')
+        self.write('notes.txt')
+        self.assertFalse(await watcher.wait(0.2))
+        self.write('example.pdf')
+        self.assertTrue(await watcher.wait(2))
+        await watcher.stop()
+
+    async def test_polling(self):
+        watcher = PollingWatcher(self.tmp.name, interval=0.05)
+        watcher.start()
+        self.assertFalse(watcher.inotify)
+        await asyncio.sleep(0.1)
+        self.write('example.pdf')
+        self.assertTrue(await watcher.wait(2))
+        self.assertFalse(await watcher.wait(0.2))
+        await watcher.stop()
+
+
+class TestScheduleReloader(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tables = os.path.join(self.tmp.name, 'schedule_tables')
+        os.mkdir(self.tables)
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+
+    async def asyncTearDown(self):
+        Database().close()
+        Database.PATH = 'users.db'
+        GroupRegistry()._index = None
+        self.tmp.cleanup()
+
+    async def test_reload(self):
+        reloaded = asyncio.Event()
+        reloader = ScheduleReloader(self.tables, on_reload=reloaded.set, debounce=0.1, interval=0.1)
+        reloader.start()
+
+        gaps = []
+
+        async def tick():
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                gaps.append(time.perf_counter() - start)
+
+        ticker = asyncio.create_task(tick())
+        shutil.copy('tests/test_tables/example.pdf', self.tables)
+        await asyncio.wait_for(reloaded.wait(), 120)
+        ticker.cancel()
+        self.assertLess(max(gaps), 1.0)  # import doesn't block the event loop
+
+        db = Database()
+        db.connect()
+        self.assertIn('101', db.get_valid_groups())
+        self.assertEqual(await reloader.reload(), [])  # unchanged tables aren't imported again
+        await reloader.stop()
+
+    async def test_reload_groups(self):
+        adb = AsyncDatabase(readers=1)
+        await adb.start()
+        groups = GroupRegistry()
+        groups.refresh()
+        self.assertNotIn('101', groups)
+
+        threads = []
+        load_index = GroupRegistry.load_index
+
+        def traced_load_index():
+            threads.append(threading.get_ident())
+            return load_index()
+
+        reloader = ScheduleReloader(self.tables, on_reload=lambda: groups.refresh_async(adb))
+        shutil.copy('tests/test_tables/example.pdf', self.tables)
+        with unittest.mock.patch.object(GroupRegistry, 'load_index', traced_load_index):
+            self.assertEqual(await reloader.reload(), [os.path.join(self.tables, 'example.pdf')])
+        await adb.close()
+
+        self.assertIn('101', groups)
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())  # groups are loaded on a reader thread of database
@@ -0,0 +1,68 @@
+from datetime import datetime
+from VMK_bot.database import Database
+from VMK_bot.lessons import NormalLesson
+from VMK_bot.schedule import Schedule, Timeline
+import os
+import tempfile
+import unittest
+
+
+class TestTimeline(unittest.TestCase):
+    def setUp(self):
+        self.intervals = [(525, 620), (630, 725), (770, 865)]
+        self.timeline = Timeline(self.intervals)
+
+    def test_mark_day_schedule(self):
+        lessons = ['1) Матанализ', '2) Алгебра', '3) Физра']
+        for now in (0, 525, 600, 620, 620.5, 630, 700, 865, 866, 1439):
+            marks = ['🟡' if start <= now <= end else '🟢' if now < start else '🔴' for start, end in self.intervals]
+            self.assertEqual(Schedule.mark_day_schedule(lessons, self.timeline, now),
+                             [lesson + ' ' + mark for lesson, mark in zip(lessons, marks)])
+        self.assertEqual(Schedule.mark_day_schedule(lessons, self.timeline, None), [lesson + ' ' for lesson in lessons])
+
+    def test_next_lesson(self):
+        self.assertEqual(self.timeline.next_lesson(0), 0)
+        self.assertEqual(self.timeline.next_lesson(525), 1)
+        self.assertEqual(self.timeline.next_lesson(625), 1)
+        self.assertIsNone(self.timeline.next_lesson(770))
+        self.assertIsNone(Timeline([]).next_lesson(0))
+
+
+class TestNextLesson(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database().close()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        Schedule.rendered.clear()
+        db = Database()
+        db.connect()
+        db.import_schedule('example.pdf', [('101', True, 0, NormalLesson(1, 525, 620, 'Матанализ')),
+                                           ('101', True, 0, NormalLesson(2, 630, 725, 'Алгебра'))])
+
+    def tearDown(self):
+        Database().close()
+        Database.PATH = 'users.db'
+        Schedule.rendered.clear()
+        self.tmp.cleanup()
+
+    def test_get_next_lesson(self):
+        self.assertEqual(Schedule.get_next_lesson('101', True, 'Понедельник', 'ru', 600.5),
+                         'Следующая пара через 30 мин.:\n2) (10.30-12.05) Алгебра')
+        self.assertEqual(Schedule.get_next_lesson('101', True, 'Понедельник', 'en', 500),
+                         'Next lesson in 25 min.:\n1) (8.45-10.20) Матанализ')
+        self.assertEqual(Schedule.get_next_lesson('101', True, 'Понедельник', 'ru', 700), 'Сегодня больше нет пар 🎉')
+        self.assertEqual(Schedule.get_next_lesson('101', True, 'Воскресенье', 'ru', 0), 'Не волнуйтесь, это воскресенье 🥳')
+
+    def test_get_today_schedule(self):
+        monday = datetime(2023, 5, 8, 10)
+        self.assertEqual(Schedule.get_today_schedule('101', True, 'Понедельник', 'ru', monday),
+                         '<b>Понедельник</b>\n1) (8.45-10.20) Матанализ 🟡\n2) (10.30-12.05) Алгебра 🟢')
+        self.assertEqual(Schedule.get_today_schedule('101', True, 'Понедельник', 'ru', datetime(2023, 5, 7, 10)),
+                         '<b>Понедельник</b>\n1) (8.45-10.20) Матанализ \n2) (10.30-12.05) Алгебра ')  # not today
+
+    def test_cache_by_resolved_language(self):
+        misses = Schedule.rendered.misses
+        for language in ('en', 'en-US', 'en_GB'):
+            Schedule.get_today_schedule('101', True, 'Понедельник', language, datetime(2023, 5, 7, 10))
+            Schedule.get_week_schedule('101', True, language)
+        self.assertEqual(Schedule.rendered.misses - misses, 2)  # one day and one week in English
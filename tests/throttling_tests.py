@@ -0,0 +1,38 @@
+from VMK_bot.throttling import TokenBucketLimiter
+import unittest
+
+
+class TestTokenBucketLimiter(unittest.TestCase):
+    def test_burst_and_refill(self):
+        limiter = TokenBucketLimiter(rate=2.0, burst=3)
+        self.assertEqual([limiter.consume(1, now=0.0) for _ in range(4)], [True, True, True, False])
+        self.assertFalse(limiter.consume(1, now=0.4))
+        self.assertTrue(limiter.consume(1, now=0.5))
+        self.assertFalse(limiter.consume(1, now=0.5))
+        self.assertTrue(limiter.consume(2, now=0.5))
+
+    def test_refill_is_capped(self):
+        limiter = TokenBucketLimiter(rate=100.0, burst=2, warn_window=1000.0)
+        limiter.consume(1, now=0.0)
+        self.assertEqual([limiter.consume(1, now=100.0) for _ in range(3)], [True, True, False])
+
+    def test_warn_once_per_window(self):
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, warn_window=10.0)
+        limiter.consume(1, now=0.0)
+        self.assertFalse(limiter.consume(1, now=0.1))
+        self.assertTrue(limiter.should_warn(1, now=0.1))
+        self.assertFalse(limiter.should_warn(1, now=5.0))
+        self.assertTrue(limiter.should_warn(1, now=10.1))
+        self.assertFalse(limiter.should_warn(2, now=10.1))
+
+    def test_idle_eviction(self):
+        limiter = TokenBucketLimiter(rate=1.0, burst=2, warn_window=5.0)
+        for user in range(100):
+            limiter.consume(user, now=user * 0.01)
+        self.assertEqual(len(limiter), 100)
+        limiter.consume('active', now=4.0)
+        self.assertEqual(len(limiter), 101)
+        limiter.consume('active', now=5.5)
+        self.assertEqual(len(limiter), 50)
+        limiter.consume('active', now=100.0)
+        self.assertEqual(len(limiter), 1)
@@ -0,0 +1,58 @@
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.users import UserStore
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+
+class TestUserStore(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        self.adb = AsyncDatabase(readers=1)
+        await self.adb.start()
+        self.users = UserStore(self.adb)
+
+    async def asyncTearDown(self):
+        await self.users.stop()
+        await self.adb.close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    async def test_unknown_user(self):
+        self.assertEqual(await self.users.get_state('student'), 'processing')
+        self.assertEqual(await self.users.get_group('student'), 'none')
+        self.assertEqual((self.users.cache.hits, self.users.cache.misses), (1, 1))
+
+    async def test_write_through(self):
+        self.users.add_user('student')
+        self.assertEqual(await self.users.get_group('student'), '')
+        self.users.set_group('student', '101')
+        self.assertEqual(await self.users.get_group('student'), '101')
+        self.assertEqual(self.users.cache.misses, 1)
+
+        await self.users.buffer.flush()
+        self.assertEqual(await self.adb.read(Database().get_user, 'student'), ('processing', '101'))
+
+    async def test_load_from_database(self):
+        await self.adb.write(Database().update_users, {'student': {'state': 'final', 'group_number': '319/1'}})
+        self.assertEqual(await self.users.get_group('student'), '319/1')
+        self.assertEqual(await self.users.get_state('student'), 'final')
+        self.assertEqual((self.users.cache.hits, self.users.cache.misses), (1, 1))
+
+    async def test_flush_during_read(self):
+        self.users.add_user('student')
+        await self.users.buffer.flush()
+        read = self.adb.read
+
+        async def read_with_flush(func, *args):
+            row = await read(func, *args)  # the row is stale once the update below is written
+            self.users.set_group('student', '101')
+            await self.users.buffer.flush()
+            return row
+
+        with unittest.mock.patch.object(self.adb, 'read', read_with_flush):
+            await self.users.get_group('student')
+        self.assertIsNone(self.users.cache.peek('student'))
+        self.assertEqual(await self.users.get_group('student'), '101')
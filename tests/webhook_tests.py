@@ -0,0 +1,55 @@
+from VMK_bot.webhook import SECRET_HEADER, create_app
+from aiogram import Dispatcher, types
+from aiohttp.test_utils import TestClient, TestServer
+from benchmarks.fake_bot import FakeBot, make_update
+import asyncio
+import unittest
+
+
+class TestWebhook(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.bot = FakeBot()
+        self.dp = Dispatcher(self.bot)
+        self.client = TestClient(TestServer(create_app(self.dp, '/webhook', 'secret')))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def post(self, update, secret='secret'):
+        headers = {SECRET_HEADER: secret} if secret is not None else {}
+        return await self.client.post('/webhook', json=update, headers=headers)
+
+    async def test_update(self):
+        @self.dp.message_handler()
+        async def echo(message: types.Message):
+            await message.answer(message.text)
+
+        response = await self.post(make_update(1, '319/1'))
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.bot.sent_texts(), ['319/1'])
+
+    async def test_secret(self):
+        for secret in (None, 'wrong'):
+            response = await self.post(make_update(1, '319/1'), secret)
+            self.assertEqual(response.status, 401)
+        self.assertEqual(self.bot.requests, [])
+
+    async def test_bad_request(self):
+        response = await self.client.post('/webhook', data='not json', headers={SECRET_HEADER: 'secret'})
+        self.assertEqual(response.status, 400)
+
+    async def test_concurrent_updates(self):
+        arrived, all_arrived = [], asyncio.Event()
+
+        @self.dp.message_handler()
+        async def wait_for_others(message: types.Message):
+            arrived.append(message.text)
+            if len(arrived) == 5:
+                all_arrived.set()
+            await asyncio.wait_for(all_arrived.wait(), timeout=5)
+            await message.answer(message.text)
+
+        responses = await asyncio.gather(*(self.post(make_update(i, str(i), user_id=i)) for i in range(1, 6)))
+        self.assertEqual([response.status for response in responses], [200] * 5)
+        self.assertEqual(sorted(self.bot.sent_texts()), ['1', '2', '3', '4', '5'])
@@ -0,0 +1,40 @@
+from VMK_bot.database import Database, AsyncDatabase
+from VMK_bot.write_behind import WriteBehindBuffer
+import os
+import tempfile
+import unittest
+
+
+class TestWriteBehindBuffer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Database.PATH = os.path.join(self.tmp.name, 'users.db')
+        self.adb = AsyncDatabase(readers=1)
+        await self.adb.start()
+        self.users = WriteBehindBuffer(self.adb, interval=60)
+
+    async def asyncTearDown(self):
+        await self.users.stop()
+        await self.adb.close()
+        Database.PATH = 'users.db'
+        self.tmp.cleanup()
+
+    async def test_coalescing(self):
+        self.users.add_user('student')
+        self.users.edit_user_group('student', '319/1')
+        self.users.edit_user_group('student', '101')
+        self.users.edit_user_subscription('student', 1, 'ru', True)
+        self.assertEqual(len(self.users), 1)
+        self.assertEqual(self.users.pending('student'), {'group_number': '101', 'chat_id': 1, 'language': 'ru', 'subscribed': 1})
+        self.assertIsNone(await self.adb.read(Database().get_user, 'student'))
+
+        await self.users.flush()
+        self.assertEqual(len(self.users), 0)
+        self.assertIsNone(self.users.pending('student'))
+        self.assertEqual(await self.adb.read(Database().get_user, 'student'), ('processing', '101'))
+
+    async def test_flush_on_stop(self):
+        self.users.start()
+        self.users.add_user('student')
+        await self.users.stop()
+        self.assertEqual(await self.adb.read(Database().get_user, 'student'), ('processing', ''))